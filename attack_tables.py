@@ -0,0 +1,72 @@
+# Per-square target masks of the 8x8 board, built once at import
+BOARD_SIZE = 8
+SQUARES = BOARD_SIZE * BOARD_SIZE
+
+KNIGHT_OFFSETS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+KING_OFFSETS = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+# Directions in which the square index grows, the first blocker is the lowest set bit
+POSITIVE_DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+NEGATIVE_DIRECTIONS = [(-1, 0), (0, -1), (-1, -1), (1, -1)]
+ROOK_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+BISHOP_DIRECTIONS = [(1, 1), (-1, 1), (-1, -1), (1, -1)]
+
+
+def _is_on_board(x: int, y: int) -> bool:
+    return 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE
+
+
+def _build_offset_masks(offsets: list[tuple[int, int]]) -> list[int]:
+    masks = []
+    for index in range(SQUARES):
+        x, y = index % BOARD_SIZE, index // BOARD_SIZE
+        mask = 0
+        for dx, dy in offsets:
+            if _is_on_board(x + dx, y + dy):
+                mask |= 1 << ((y + dy) * BOARD_SIZE + x + dx)
+        masks.append(mask)
+    return masks
+
+
+def _build_ray_masks(direction: tuple[int, int]) -> list[int]:
+    dx, dy = direction
+    masks = []
+    for index in range(SQUARES):
+        x, y = index % BOARD_SIZE + dx, index // BOARD_SIZE + dy
+        mask = 0
+        while _is_on_board(x, y):
+            mask |= 1 << (y * BOARD_SIZE + x)
+            x, y = x + dx, y + dy
+        masks.append(mask)
+    return masks
+
+
+def _build_between_masks() -> list[list[int]]:
+    between = [[0] * SQUARES for _ in range(SQUARES)]
+    for index in range(SQUARES):
+        for dx, dy in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            x, y = index % BOARD_SIZE + dx, index // BOARD_SIZE + dy
+            mask = 0
+            while _is_on_board(x, y):
+                target = y * BOARD_SIZE + x
+                between[index][target] = mask
+                mask |= 1 << target
+                x, y = x + dx, y + dy
+    return between
+
+
+KNIGHT_ATTACKS = _build_offset_masks(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_offset_masks(KING_OFFSETS)
+WHITE_PAWN_ATTACKS = _build_offset_masks([(-1, 1), (1, 1)])
+BLACK_PAWN_ATTACKS = _build_offset_masks([(-1, -1), (1, -1)])
+RAYS = {direction: _build_ray_masks(direction) for direction in POSITIVE_DIRECTIONS + NEGATIVE_DIRECTIONS}
+BETWEEN = _build_between_masks()
+# Every square a slider could reach from a square on an empty board
+ROOK_LINES = [RAYS[(1, 0)][index] | RAYS[(-1, 0)][index] | RAYS[(0, 1)][index] | RAYS[(0, -1)][index]
+              for index in range(SQUARES)]
+BISHOP_LINES = [RAYS[(1, 1)][index] | RAYS[(-1, -1)][index] | RAYS[(-1, 1)][index] | RAYS[(1, -1)][index]
+                for index in range(SQUARES)]
+
+
+# Squares are given by index, off-board squares are negative and never a target
+def is_target(table: list[int], current_square: int, new_square: int) -> bool:
+    return current_square >= 0 and new_square >= 0 and bool(table[current_square] >> new_square & 1)
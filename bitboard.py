@@ -0,0 +1,135 @@
+from point import Point
+from pawns import *
+from attack_tables import *
+
+
+PAWN_ATTACKS = {Color.WHITE: WHITE_PAWN_ATTACKS, Color.BLACK: BLACK_PAWN_ATTACKS}
+
+
+def square_index(point: Point) -> int:
+    return point.y * BOARD_SIZE + point.x
+
+
+def square_bit(point: Point) -> int:
+    return 1 << (point.y * BOARD_SIZE + point.x)
+
+
+def index_to_point(index: int) -> Point:
+    return Point.from_index(index)
+
+
+PIECE_TYPES = {
+    Color.WHITE: {"pawn": WhitePawn, "knight": WhiteKnight, "bishop": WhiteBishop,
+                  "rook": WhiteRook, "queen": WhiteQueen, "king": WhiteKing},
+    Color.BLACK: {"pawn": BlackPawn, "knight": BlackKnight, "bishop": BlackBishop,
+                  "rook": BlackRook, "queen": BlackQueen, "king": BlackKing},
+}
+
+
+def ray_attacks(index: int, occupied: int, directions: list[tuple[int, int]]) -> int:
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][index]
+        blockers = ray & occupied
+        if blockers:
+            if direction in POSITIVE_DIRECTIONS:
+                first_blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                first_blocker = blockers.bit_length() - 1
+            ray ^= RAYS[direction][first_blocker]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(index: int, occupied: int) -> int:
+    return ray_attacks(index, occupied, ROOK_DIRECTIONS)
+
+
+def bishop_attacks(index: int, occupied: int) -> int:
+    return ray_attacks(index, occupied, BISHOP_DIRECTIONS)
+
+
+def iterate_bits(mask: int):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class Bitboards:
+    def __init__(self) -> None:
+        self.pieces: dict[type, int] = {piece_type: 0 for types in PIECE_TYPES.values()
+                                        for piece_type in types.values()}
+        self.occupancy = {Color.WHITE: 0, Color.BLACK: 0}
+        self.occupied = 0
+
+    def put_piece(self, piece: Pawn, position: Point) -> None:
+        bit = square_bit(position)
+        self.pieces[type(piece)] |= bit
+        self.occupancy[piece.color] |= bit
+        self.occupied |= bit
+
+    def remove_piece(self, piece: Pawn, position: Point) -> None:
+        bit = ~square_bit(position)
+        self.pieces[type(piece)] &= bit
+        self.occupancy[piece.color] &= bit
+        self.occupied &= bit
+
+    def get_pieces(self, color: Color, name: str) -> int:
+        return self.pieces[PIECE_TYPES[color][name]]
+
+    def is_occupied(self, position: Point) -> bool:
+        return bool(self.occupied & square_bit(position))
+
+    def is_path_clear(self, current_pos: Point, new_pos: Point) -> bool:
+        return not BETWEEN[square_index(current_pos)][square_index(new_pos)] & self.occupied
+
+    def attacks_from(self, piece: Pawn, position: Point) -> int:
+        index = square_index(position)
+        kind = piece.kind
+        if kind == PAWN:
+            return PAWN_ATTACKS[piece.color][index]
+        elif kind == KNIGHT:
+            return KNIGHT_ATTACKS[index]
+        elif kind == KING:
+            return KING_ATTACKS[index]
+        elif kind == BISHOP:
+            return bishop_attacks(index, self.occupied)
+        elif kind == ROOK:
+            return rook_attacks(index, self.occupied)
+        elif kind == QUEEN:
+            return rook_attacks(index, self.occupied) | bishop_attacks(index, self.occupied)
+        return 0
+
+    # Sliders see through the opposing king, so squares behind it along the
+    # checking ray are attacked too and king moves are a single lookup
+    def attack_map(self, color: Color) -> int:
+        defender = Color.BLACK if color == Color.WHITE else Color.WHITE
+        occupied = self.occupied & ~self.get_pieces(defender, "king")
+        pawn_attacks, attacks = PAWN_ATTACKS[color], 0
+        for index in iterate_bits(self.get_pieces(color, "pawn")):
+            attacks |= pawn_attacks[index]
+        for index in iterate_bits(self.get_pieces(color, "knight")):
+            attacks |= KNIGHT_ATTACKS[index]
+        for index in iterate_bits(self.get_pieces(color, "king")):
+            attacks |= KING_ATTACKS[index]
+        queens = self.get_pieces(color, "queen")
+        for index in iterate_bits(self.get_pieces(color, "rook") | queens):
+            attacks |= rook_attacks(index, occupied)
+        for index in iterate_bits(self.get_pieces(color, "bishop") | queens):
+            attacks |= bishop_attacks(index, occupied)
+        return attacks
+
+    def is_square_attacked(self, position: Point, by_color: Color) -> bool:
+        index = square_index(position)
+        defender = Color.BLACK if by_color == Color.WHITE else Color.WHITE
+        if PAWN_ATTACKS[defender][index] & self.get_pieces(by_color, "pawn"):
+            return True
+        if KNIGHT_ATTACKS[index] & self.get_pieces(by_color, "knight"):
+            return True
+        if KING_ATTACKS[index] & self.get_pieces(by_color, "king"):
+            return True
+        queens = self.get_pieces(by_color, "queen")
+        if rook_attacks(index, self.occupied) & (self.get_pieces(by_color, "rook") | queens):
+            return True
+        return bool(bishop_attacks(index, self.occupied) & (self.get_pieces(by_color, "bishop") | queens))
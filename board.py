@@ -1,7 +1,13 @@
-from typing import List, Optional
+from typing import Optional
 
 from point import Point
 from pawns import *
+from bitboard import Bitboards, KNIGHT_OFFSETS, KING_OFFSETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS
+from piece_index import PieceIndex
+from pin_analysis import PinAnalysis, analyze_pins
+from instrumentation import EngineStats
+import position_codec
+import zobrist
 import utils
 
 
@@ -10,52 +16,119 @@ logger = utils.get_logger(__name__)
 
 
 class Board:
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int, use_bitboards: bool = False, debug: bool = False) -> None:
+        if use_bitboards and (width, height) != (8, 8):
+            raise ValueError("Bitboards are supported only on the 8x8 board")
         self.width = width
         self.height = height
+        self.bitboards = Bitboards() if use_bitboards else None
+        self.debug = debug
+        self.king_positions: dict[Color, Point] = {}
+        self.zobrist_keys = zobrist.get_keys(width * height)
+        self.position_key = 0
+        self.black_moves_first = False
+        self.stats: Optional[EngineStats] = None
+        # Per-position analysis (attack maps, pins) keyed by (kind, color), dropped on every change
+        self.__position_cache: dict[tuple[str, Color], object] = {}
+        self.__saved_position_caches: list[dict[tuple[str, Color], object]] = []
         self.board = [[EMPTY_SQUARE for _ in range(width)] for _ in range(height)]
-        self.white_pawns = [
+        self.white_pawns = PieceIndex(width, height, [
             (WhiteRook, Point(0,0)), (WhiteKnight, Point(1,0)), (WhiteBishop, Point(2,0)), (WhiteQueen, Point(3,0)),
             (WhiteKing, Point(4,0)), (WhiteBishop, Point(5,0)), (WhiteKnight, Point(6,0)), (WhiteRook, Point(7,0)),
             (WhitePawn, Point(0,1)), (WhitePawn, Point(1,1)), (WhitePawn, Point(2,1)), (WhitePawn, Point(3,1)),
             (WhitePawn, Point(4,1)), (WhitePawn, Point(5,1)), (WhitePawn, Point(6,1)), (WhitePawn, Point(7,1))
-            ]
+            ])
             
-        self.black_pawns = [
+        self.black_pawns = PieceIndex(width, height, [
             (BlackRook, Point(0,7)), (BlackKnight, Point(1,7)), (BlackBishop, Point(2,7)), (BlackQueen, Point(3,7)),
             (BlackKing, Point(4,7)), (BlackBishop, Point(5,7)), (BlackKnight, Point(6,7)), (BlackRook, Point(7,7)),
             (BlackPawn, Point(0,6)), (BlackPawn, Point(1,6)), (BlackPawn, Point(2,6)), (BlackPawn, Point(3,6)),
             (BlackPawn, Point(4,6)), (BlackPawn, Point(5,6)), (BlackPawn, Point(6,6)), (BlackPawn, Point(7,6))
-            ]
+            ])
         self.__set_white_pawns()
         self.__set_black_pawns()
         self.movements_history: list[tuple[Point, Point]] = []
         self.captured_pawns: list[Pawn] = [] 
+        self.__simulated_captures: list[int] = []
     
-    def get_white_pawns(self) -> List[tuple]:
-        return self.white_pawns.copy()
+    def get_white_pawns(self) -> PieceIndex:
+        return self.white_pawns
     
-    def get_black_pawns(self) -> List[tuple]:
-        return self.black_pawns.copy()
+    def get_black_pawns(self) -> PieceIndex:
+        return self.black_pawns
     
+    def __get_pawns(self, color: Color) -> PieceIndex:
+        return self.white_pawns if color == Color.WHITE else self.black_pawns
+
     def get_board(self) -> list[list[Pawn]]:
         return self.board
     
     def get_piece(self, point: Point) -> Pawn:
+        if self.bitboards is not None and not self.bitboards.is_occupied(point):
+            return EMPTY_SQUARE
         return self.board[point.y][point.x]
     
     def get_king_position(self, opponent_color: Color) -> Optional[Point]:
+        for color, position in self.king_positions.items():
+            if color != opponent_color:
+                if self.debug:
+                    assert position == self.__find_king_position(opponent_color), \
+                        f"Cached {color} king position {position} is out of sync with the board"
+                return position
+        if self.debug:
+            assert self.__find_king_position(opponent_color) is None, "King missing from the cache"
+        return None
+
+    def __find_king_position(self, opponent_color: Color) -> Optional[Point]:
         for y, row in enumerate(self.get_board()):
             for x, piece in enumerate(row):
                 if isinstance(piece, King) and piece.color != opponent_color:
-                    return Point(x, y)
+                    return Point.of(x, y)
         return None
 
     def __set_pawn(self, pawn: Pawn, position: Point) -> None:
-        logger.info(f"Setting {pawn} at the {position}")
+        if utils.TRACE:
+            logger.debug("Setting %s at the %s", pawn, position)
+        if self.bitboards is not None:
+            self.__update_bitboards(pawn, position)
+        self.__update_king_positions(pawn, position)
+        self.__update_position_key(pawn, position)
+        if self.__position_cache:
+            self.__position_cache = {}
         self.board[position.y][position.x] = pawn
+
+    def __update_position_key(self, pawn: Pawn, position: Point) -> None:
+        square = position.y * self.width + position.x
+        previous = self.board[position.y][position.x]
+        if isinstance(previous, Pawn):
+            self.position_key ^= self.zobrist_keys.piece_key(previous, square)
+        if isinstance(pawn, Pawn):
+            self.position_key ^= self.zobrist_keys.piece_key(pawn, square)
+
+    def __switch_side_to_move(self) -> None:
+        self.position_key ^= self.zobrist_keys.side_to_move
+
+    # Full recomputation, used to verify the incrementally updated position_key
+    def compute_position_key(self) -> int:
+        black_to_move = (len(self.movements_history) + len(self.__saved_position_caches)
+                         + self.black_moves_first) % 2 == 1
+        return self.zobrist_keys.hash_position(self.board, black_to_move)
+
+    def __update_king_positions(self, pawn: Pawn, position: Point) -> None:
+        previous = self.board[position.y][position.x]
+        if isinstance(previous, King) and self.king_positions.get(previous.color) == position:
+            del self.king_positions[previous.color]
+        if isinstance(pawn, King):
+            self.king_positions[pawn.color] = position
+
+    def __update_bitboards(self, pawn: Pawn, position: Point) -> None:
+        previous = self.board[position.y][position.x]
+        if isinstance(previous, Pawn):
+            self.bitboards.remove_piece(previous, position)
+        if isinstance(pawn, Pawn):
+            self.bitboards.put_piece(pawn, position)
     
-    def __set_pawns(self, pawns: List[tuple]) -> None:
+    def __set_pawns(self, pawns: PieceIndex) -> None:
         for pawn, position in pawns:
             self.__set_pawn(pawn(), position)
 
@@ -68,22 +141,62 @@ class Board:
     def __set_empty_position(self, position: Point) -> None:
         self.__set_pawn(EMPTY_SQUARE, position)
 
+    def set_position(self, pieces: list[tuple[type, Point]], black_to_move: bool = False) -> None:
+        # Cleared in place rather than square by square, placing the pieces on the empty
+        # grid rebuilds the position key, king positions and bitboards
+        for row in self.board:
+            row[:] = [EMPTY_SQUARE] * self.width
+        if self.bitboards is not None:
+            self.bitboards = Bitboards()
+        self.king_positions = {}
+        self.__position_cache = {}
+        white_pawns, black_pawns = [], []
+        for piece_type, position in pieces:
+            (white_pawns if piece_type.color == Color.WHITE else black_pawns).append((piece_type, position))
+        self.white_pawns = PieceIndex(self.width, self.height, white_pawns)
+        self.black_pawns = PieceIndex(self.width, self.height, black_pawns)
+        self.movements_history = []
+        self.captured_pawns = []
+        self.__simulated_captures = []
+        self.__saved_position_caches = []
+        self.position_key = 0
+        self.__set_white_pawns()
+        self.__set_black_pawns()
+        self.black_moves_first = black_to_move
+        if black_to_move:
+            self.__switch_side_to_move()
+
+    def is_black_to_move(self) -> bool:
+        return (len(self.movements_history) + self.black_moves_first) % 2 == 1
+
+    def load_fen(self, fen: str) -> None:
+        self.set_position(*position_codec.parse_fen(fen))
+
+    def to_fen(self) -> str:
+        fullmove = (len(self.movements_history) + self.black_moves_first) // 2 + 1
+        return position_codec.rows_to_fen(self.board, self.is_black_to_move(), fullmove)
+
+    # 33 bytes: a nibble per square and the side to move, see position_codec
+    def pack(self) -> bytes:
+        return position_codec.pack_squares(position_codec.board_squares(self), self.is_black_to_move())
+
+    def load_packed(self, data: bytes) -> None:
+        self.set_position(*position_codec.unpack_position(data))
+
     def __add_pawn_to_the_list(self, pawn: Pawn, current_pos: Point, position: Point) -> None: 
         if pawn.color == Color.WHITE:
-            self.white_pawns.remove((type(pawn), current_pos))
-            self.white_pawns.append((type(pawn), position))
+            self.white_pawns.move(current_pos, position)
         elif pawn.color == Color.BLACK:
-            self.black_pawns.remove((type(pawn), current_pos))
-            self.black_pawns.append((type(pawn), position))
+            self.black_pawns.move(current_pos, position)
 
     def update_board_after_capture(self, pawn: Pawn, target_pawn_pos,
                                     target_pawn, current_pos, new_pos, turn) -> None:
         if isinstance(target_pawn, King):
             return
         if turn == Color.WHITE:
-            self.black_pawns.remove((type(target_pawn), target_pawn_pos))
+            self.black_pawns.remove(target_pawn_pos)
         elif turn == Color.BLACK:
-            self.white_pawns.remove((type(target_pawn), target_pawn_pos))
+            self.white_pawns.remove(target_pawn_pos)
         self.execute_move(pawn, current_pos, new_pos)
 
     def execute_move(self, pawn: Pawn, current_pos: Point, new_pos: Point) -> None:
@@ -91,12 +204,17 @@ class Board:
         self.__set_pawn(pawn, new_pos)
         self.__set_empty_position(current_pos)
         self.movements_history.append((current_pos, new_pos))
-        logger.debug(f"Executed move: {pawn} from {current_pos} to {new_pos}")
+        self.__switch_side_to_move()
+        logger.debug("Executed move: %s from %s to %s", pawn, current_pos, new_pos)
     
     def is_out_of_bounds(self, position: Point) -> bool:
         return not (0 <= position.x < self.width and 0 <= position.y < self.height)
     
     def is_path_clear(self, current_pos: Point, new_pos: Point) -> bool:  
+        if self.stats is not None:
+            self.stats.path_checks += 1
+        if self.bitboards is not None:
+            return self.bitboards.is_path_clear(current_pos, new_pos)
         distance_x = new_pos.x - current_pos.x
         distance_y = new_pos.y - current_pos.y
 
@@ -107,24 +225,128 @@ class Board:
 
         while(x, y) != (new_pos.x, new_pos.y):
             if self.board[y][x] != EMPTY_SQUARE:
-                logger.debug(f"Path is not clear")
+                if utils.TRACE:
+                    logger.debug("Path is not clear")
                 return False
             x += step_x
             y += step_y
-        logger.debug(f"Path is clear from {current_pos} to {new_pos}")
+        if utils.TRACE:
+            logger.debug("Path is clear from %s to %s", current_pos, new_pos)
         return True
+
+    def is_square_attacked(self, position: Point, by_color: Color) -> bool:
+        if self.bitboards is not None:
+            return self.bitboards.is_square_attacked(position, by_color)
+        for _, attacker_pos in self.__get_pawns(by_color):
+            attacker = self.get_piece(attacker_pos)
+            if isinstance(attacker, Pawn) and attacker.color == by_color and attacker_pos != position:
+                if attacker.can_capture(attacker_pos, position) and \
+                        (attacker.kind == KNIGHT or self.is_path_clear(attacker_pos, position)):
+                    return True
+        return False
     
+    def compute_attack_map(self, color: Color) -> int:
+        attack_map = self.__position_cache.get(("attacks", color))
+        if attack_map is None:
+            if self.bitboards is not None:
+                attack_map = self.bitboards.attack_map(color)
+            else:
+                attack_map = self.__build_attack_map(color)
+            self.__position_cache[("attacks", color)] = attack_map
+        return attack_map
+
+    def get_pin_analysis(self, color: Color) -> PinAnalysis:
+        analysis = self.__position_cache.get(("pins", color))
+        if analysis is None:
+            analysis = analyze_pins(self, color)
+            self.__position_cache[("pins", color)] = analysis
+        return analysis
+
+    def is_in_check(self, color: Color) -> bool:
+        if self.stats is not None:
+            self.stats.check_evaluations += 1
+        king_pos = self.king_positions.get(color)
+        if king_pos is None:
+            return False
+        opponent = Color.BLACK if color == Color.WHITE else Color.WHITE
+        attack_map = self.__position_cache.get(("attacks", opponent))
+        if attack_map is None:
+            # A one-off query is cheaper than building the map of a simulated position
+            return self.is_square_attacked(king_pos, opponent)
+        return bool(attack_map & self.square_bit(king_pos))
+
+    def square_bit(self, position: Point) -> int:
+        return 1 << (position.y * self.width + position.x)
+
+    def __build_attack_map(self, color: Color) -> int:
+        attack_map = 0
+        for _, position in self.__get_pawns(color):
+            pawn = self.board[position.y][position.x]
+            if not isinstance(pawn, Pawn) or pawn.color != color:
+                continue
+            kind = pawn.kind
+            if kind == PAWN:
+                direction = 1 if color == Color.WHITE else -1
+                attack_map |= self.__offset_attacks(position, [(-1, direction), (1, direction)])
+            elif kind == KNIGHT:
+                attack_map |= self.__offset_attacks(position, KNIGHT_OFFSETS)
+            elif kind == KING:
+                attack_map |= self.__offset_attacks(position, KING_OFFSETS)
+            elif kind == BISHOP:
+                attack_map |= self.__ray_attacks(position, BISHOP_DIRECTIONS, color)
+            elif kind == ROOK:
+                attack_map |= self.__ray_attacks(position, ROOK_DIRECTIONS, color)
+            elif kind == QUEEN:
+                attack_map |= self.__ray_attacks(position, ROOK_DIRECTIONS + BISHOP_DIRECTIONS, color)
+        return attack_map
+
+    def __offset_attacks(self, position: Point, offsets: list[tuple[int, int]]) -> int:
+        attacks = 0
+        for dx, dy in offsets:
+            x, y = position.x + dx, position.y + dy
+            if 0 <= x < self.width and 0 <= y < self.height:
+                attacks |= 1 << (y * self.width + x)
+        return attacks
+
+    # Rays pass through the opposing king, like in Bitboards.attack_map
+    def __ray_attacks(self, position: Point, directions: list[tuple[int, int]], color: Color) -> int:
+        attacks = 0
+        for dx, dy in directions:
+            x, y = position.x + dx, position.y + dy
+            while 0 <= x < self.width and 0 <= y < self.height:
+                attacks |= 1 << (y * self.width + x)
+                target = self.board[y][x]
+                if isinstance(target, Pawn) and not (isinstance(target, King) and target.color != color):
+                    break
+                x, y = x + dx, y + dy
+        return attacks
+
     # Methods related to move simulation
     def make_move(self, pawn: Pawn, new_pos: Point, current_pos: Point) -> None:
+        if self.stats is not None:
+            self.stats.make_moves += 1
+        self.__saved_position_caches.append(self.__position_cache)
+        self.__position_cache = {}
+        target = self.board[new_pos.y][new_pos.x]
+        if isinstance(target, Pawn):
+            self.__simulated_captures.append(self.__get_pawns(target.color).remove(new_pos))
         self.__set_pawn(pawn, new_pos)
         self.__add_pawn_to_the_list(pawn, current_pos, new_pos)
         self.__set_empty_position(current_pos)
+        self.__switch_side_to_move()
 
     # Methods related to move simulation
     def undo_move(self, pawn: Pawn, current_pos: Point, new_pos: Point, original_target: Pawn) -> None:
+        if self.stats is not None:
+            self.stats.undo_moves += 1
         self.__set_pawn(original_target, new_pos)
         self.__add_pawn_to_the_list(pawn, new_pos, current_pos)
         self.__set_pawn(pawn, current_pos)
+        if isinstance(original_target, Pawn):
+            self.__get_pawns(original_target.color).restore(type(original_target), new_pos,
+                                                            self.__simulated_captures.pop())
+        self.__position_cache = self.__saved_position_caches.pop()
+        self.__switch_side_to_move()
     
     # Methods related to move simulation
     def __is_move_valid(self, pawn: Pawn, current_pos: Point, new_pos: Point, check_handler, turn) -> bool:
@@ -133,21 +355,28 @@ class Board:
         try:
             attacked_king_color = check_handler.get_checked_king_color(turn)
             if attacked_king_color == turn:
-                logger.info(f"Your king {attacked_king_color} is under check")
+                if utils.TRACE:
+                    logger.debug("Your king %s is under check", attacked_king_color)
                 return False
             elif attacked_king_color != None:
-                logger.info(f"{attacked_king_color} is under check. You can attack!")
+                if utils.TRACE:
+                    logger.debug("%s is under check. You can attack!", attacked_king_color)
                 return True
             else:
-                logger.info(f"There is no check after simulated move, who: {pawn}, from: {current_pos}, to: {new_pos}")
+                if utils.TRACE:
+                    logger.debug("There is no check after simulated move, who: %s, from: %s, to: %s",
+                                 pawn, current_pos, new_pos)
                 return True
         finally:
             self.undo_move(pawn, current_pos, new_pos, original_target)
 
     # Methods related to move simulation
     def is_simulated_action_valid(self, pawn: Pawn, current_pos: Point, new_pos: Point, check_handler, turn) -> bool:
+        if pawn.color == turn and pawn.kind != KING:
+            return self.get_pin_analysis(turn).allows(current_pos, new_pos)
         attacked_king_color = check_handler.get_checked_king_color(turn)
-        logger.info(f"Before first move {attacked_king_color}")
+        if utils.TRACE:
+            logger.debug("Before first move %s", attacked_king_color)
         if attacked_king_color != None:
             return check_handler.will_the_move_escape_the_check(pawn, attacked_king_color, current_pos, new_pos, check_handler, turn) 
         else:
@@ -1,7 +1,7 @@
 from typing import Optional
 
 from point import Point
-from pawns import Pawn, Knight, Color
+from pawns import Pawn, Color, KNIGHT
 import utils
 
 
@@ -16,7 +16,7 @@ class CaptureHandler:
         target_pawn = self.__get_opponent(pawn, new_pos)
         if target_pawn:
             if pawn.can_capture(current_pos, new_pos):
-                if isinstance(pawn, Knight):
+                if pawn.kind == KNIGHT:
                     return self.board.is_simulated_action_valid(pawn, current_pos,
                                                                  new_pos, check_handler, turn)
                 elif self.board.is_path_clear(current_pos, new_pos):
@@ -31,7 +31,7 @@ class CaptureHandler:
                 return
             target_pawn, target_pawn_pos = opponent
             # self.board.captured_pawns.append(target_pawn)
-            logger.info(f"{pawn} is capturing piece at {target_pawn_pos}")
+            logger.info("%s is capturing piece at %s", pawn, target_pawn_pos)
             self.board.update_board_after_capture(pawn, target_pawn_pos,
                                             target_pawn, current_pos, new_pos, turn)
             return True
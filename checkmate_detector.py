@@ -0,0 +1,60 @@
+from typing import Iterator, Optional
+
+from point import Point
+from pawns import *
+from move_generator import MoveGenerator
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+
+class CheckmateDetector:
+    def __init__(self, board, move_generator: Optional[MoveGenerator] = None) -> None:
+        self.board = board
+        self.move_generator = move_generator or MoveGenerator(board)
+
+    # Cheapest refutations first: king moves, capturing the checker, blocking the check ray
+    def is_checkmate(self, color: Color) -> bool:
+        analysis = self.board.get_pin_analysis(color)
+        if not analysis.is_check():
+            return False
+        king_pos = self.board.king_positions.get(color)
+        if king_pos is not None and self.__can_king_escape(king_pos):
+            logger.debug("The %s king can step out of the check", color)
+            return False
+        if analysis.is_double_check():
+            return True
+        checker = analysis.checkers[0]
+        if not isinstance(self.board.get_piece(checker), King) and self.__can_any_piece_reach(color, checker, True):
+            logger.debug("The checker at %s can be captured", checker)
+            return False
+        for square in self.__interposition_squares(analysis.check_mask, checker):
+            if self.__can_any_piece_reach(color, square, False):
+                logger.debug("The check can be blocked at %s", square)
+                return False
+        return True
+
+    def __can_king_escape(self, king_pos: Point) -> bool:
+        return next(self.move_generator.legal_moves_from(king_pos), None) is not None
+
+    def __interposition_squares(self, check_mask: int, checker: Point) -> Iterator[Point]:
+        check_mask &= ~self.board.square_bit(checker)
+        while check_mask:
+            lowest = check_mask & -check_mask
+            index = lowest.bit_length() - 1
+            yield Point.of(index % self.board.width, index // self.board.width)
+            check_mask ^= lowest
+
+    def __can_any_piece_reach(self, color: Color, target: Point, is_capture: bool) -> bool:
+        pawns = self.board.get_white_pawns() if color == Color.WHITE else self.board.get_black_pawns()
+        analysis = self.board.get_pin_analysis(color)
+        for _, position in pawns:
+            pawn = self.board.get_piece(position)
+            if not isinstance(pawn, Pawn) or pawn.color != color or pawn.kind == KING:
+                continue
+            can_reach = pawn.can_capture(position, target) if is_capture else pawn.can_move(position, target)
+            if can_reach and (pawn.kind == KNIGHT or self.board.is_path_clear(position, target)) \
+                    and analysis.allows(position, target):
+                return True
+        return False
@@ -1,3 +1,6 @@
+from contextlib import nullcontext
+from typing import Any, Iterator, Optional
+
 import pygame
 
 import utils
@@ -7,37 +10,137 @@ from pawns import *
 from move_handler import MoveHandler
 from check_handler import CheckHandler
 from capture_handler import CaptureHandler
+from move_generator import MoveGenerator, Move
+from position_cache import PositionCache
+from search import Search, SearchResult
+from parallel_search import ParallelSearch
+import perft
+from transposition_table import TranspositionTable
+from instrumentation import EngineStats
+from move_result import MoveStatus, MoveResult
 from game_over_exception import GameOverException
 from check_exception import CheckException
 
 logger = utils.get_logger(__name__)
 
+_NO_PHASE = nullcontext()
+
 
 class ChessEngine:
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 4096, tt_size_mb: float = 16,
+                 search_workers: int = 1, collect_stats: bool = False) -> None:
         self.board = Board(8, 8)
         self.move_handler = MoveHandler(self.board)
         self.capture_handler = CaptureHandler(self.board)
         self.check_handler = CheckHandler(self.board, self.move_handler, self.capture_handler)
+        self.move_generator = MoveGenerator(self.board)
+        self.position_cache = PositionCache(cache_size)
+        self.search = Search(self.board, self.move_generator)
+        self.tt_size_mb = tt_size_mb
+        self.transposition_table: Optional[TranspositionTable] = None
+        self.search_workers = search_workers
+        self.parallel_search: Optional[ParallelSearch] = None
+        self.__stats: Optional[EngineStats] = None
+        self.set_stats_enabled(collect_stats)
+        self.winner: Optional[Color] = None
 
     def get_board(self) -> Board:
         return self.board.get_board()
 
+    def load_fen(self, fen: str) -> None:
+        self.board.load_fen(fen)
+        self.winner = None
+
+    def to_fen(self) -> str:
+        return self.board.to_fen()
+
     def move_piece(self, current_pos: Point, new_pos: Point) -> bool:
         turn = self.check_whose_turn()
-        if not self.move_handler.move_piece(current_pos, new_pos, turn, self.check_handler):
+        with self.__phase("validation"):
+            moved = self.move_handler.move_piece(current_pos, new_pos, turn, self.check_handler)
+        if not moved:
             logger.debug("move_handler.move_piece() is not valid, is it capture?")
             piece = self.board.get_piece(current_pos)
-            if self.capture_handler.capture(piece, current_pos, new_pos, turn, self.check_handler):
-                if self.check_handler.get_checked_king_color(turn) != None:
-                    self.__handle_checkmate_or_check(turn, self.check_handler)
+            with self.__phase("capture"):
+                captured = self.capture_handler.capture(piece, current_pos, new_pos, turn, self.check_handler)
+            if captured:
+                with self.__phase("check"):
+                    if self.get_checked_king_color(turn) != None:
+                        self.__handle_checkmate_or_check(turn, self.check_handler)
             else:
                 logger.debug("move is not valid and there is no check")
-        elif self.check_handler.get_checked_king_color(turn) != None:
-            self.__handle_checkmate_or_check(turn, self.check_handler)
         else:
+            with self.__phase("check"):
+                if self.get_checked_king_color(turn) != None:
+                    self.__handle_checkmate_or_check(turn, self.check_handler)
             logger.debug("move_handler.move_piece is valid")
         return True
+
+    # Validates against the move generator and reports check and checkmate in the result,
+    # illegal moves leave the board untouched. Used by the server, nothing is raised.
+    # turn defaults to the side to move by the move history.
+    def apply_move(self, current_pos: Point, new_pos: Point, turn: Optional[Color] = None) -> MoveResult:
+        if self.winner is not None:
+            return MoveResult(MoveStatus.ILLEGAL, reason="game is over")
+        turn = turn or self.check_whose_turn()
+        if self.board.is_out_of_bounds(current_pos) or self.board.is_out_of_bounds(new_pos):
+            return MoveResult(MoveStatus.ILLEGAL, reason="square is off the board")
+        pawn = self.board.get_piece(current_pos)
+        if not isinstance(pawn, Pawn) or pawn.color != turn:
+            return MoveResult(MoveStatus.ILLEGAL, reason=f"no {turn.name.lower()} piece at {current_pos}")
+        with self.__phase("validation"):
+            legal = new_pos in self.move_generator.generate_pseudo_legal_moves(pawn, current_pos) \
+                and self.move_generator.is_legal(pawn, current_pos, new_pos)
+        if not legal:
+            return MoveResult(MoveStatus.ILLEGAL, reason=f"{pawn} cannot move from {current_pos} to {new_pos}")
+        self.__execute(pawn, current_pos, new_pos, turn)
+        move = (current_pos, new_pos)
+        opponent = Color.BLACK if turn == Color.WHITE else Color.WHITE
+        with self.__phase("check"):
+            if not self.board.is_in_check(opponent):
+                return MoveResult(MoveStatus.LEGAL, move)
+            if self.position_cache.get_or_compute((self.board.position_key, opponent), "checkmate",
+                                                  lambda: self.__find_checkmate(opponent, self.check_handler)):
+                self.winner = turn
+                return MoveResult(MoveStatus.CHECKMATE, move)
+        return MoveResult(MoveStatus.CHECK, move)
+
+    # Replays a move that was validated elsewhere, e.g. by an EnginePool worker
+    def apply_result(self, result: MoveResult) -> None:
+        current_pos, new_pos = result.move
+        turn = self.check_whose_turn()
+        self.__execute(self.board.get_piece(current_pos), current_pos, new_pos, turn)
+        if result.status == MoveStatus.CHECKMATE:
+            self.winner = turn
+
+    def __execute(self, pawn: Pawn, current_pos: Point, new_pos: Point, turn: Color) -> None:
+        target = self.board.get_piece(new_pos)
+        if isinstance(target, Pawn):
+            with self.__phase("capture"):
+                self.board.update_board_after_capture(pawn, new_pos, target, current_pos, new_pos, turn)
+        else:
+            self.board.execute_move(pawn, current_pos, new_pos)
+
+    def __phase(self, name: str):
+        return self.__stats.phase(name) if self.__stats is not None else _NO_PHASE
+
+    def set_stats_enabled(self, enabled: bool) -> None:
+        self.__stats = (self.__stats or EngineStats()) if enabled else None
+        self.board.stats = self.__stats
+
+    def stats(self) -> dict[str, Any]:
+        stats = self.__stats.as_dict() if self.__stats is not None else {}
+        stats["position_cache"] = self.position_cache.get_stats()
+        if self.transposition_table is not None:
+            stats["transposition_table"] = self.transposition_table.get_stats()
+        return stats
+
+    def reset_stats(self) -> None:
+        if self.__stats is not None:
+            self.__stats.reset()
+        self.position_cache.reset_stats()
+        if self.transposition_table is not None:
+            self.transposition_table.reset_stats()
     
     def __handle_checkmate_or_check(self, turn, check_handler) -> bool:
         if self.__is_checkmate(turn, check_handler):
@@ -46,27 +149,61 @@ class ChessEngine:
         self.current_turn = self.__switch_turn()
         raise CheckException("Check!")
     
+    def get_checked_king_color(self, turn: Color) -> Optional[Color]:
+        return self.position_cache.get_or_compute((self.board.position_key, turn), "checked_king_color",
+                                                  lambda: self.check_handler.get_checked_king_color(turn))
+
+    def generate_legal_moves(self, color: Color) -> Iterator[Move]:
+        moves = self.position_cache.get_or_compute((self.board.position_key, color), "legal_moves",
+                                                   lambda: tuple(self.move_generator.generate_legal_moves(color)))
+        return iter(moves)
+
+    def legal_moves_from(self, point: Point) -> Iterator[Move]:
+        return self.move_generator.legal_moves_from(point)
+
+    def best_move(self, time_ms: Optional[int] = None, depth: Optional[int] = None,
+                  max_nodes: Optional[int] = None) -> SearchResult:
+        if self.search_workers > 1:
+            if self.parallel_search is None:
+                self.parallel_search = ParallelSearch(self.board, self.move_generator, self.search_workers,
+                                                      self.tt_size_mb)
+            return self.parallel_search.search(self.check_whose_turn(), depth=depth, time_ms=time_ms,
+                                               max_nodes=max_nodes)
+        if self.transposition_table is None:
+            # Allocated on the first search, engines that never search don't pay for it
+            self.transposition_table = TranspositionTable(self.tt_size_mb)
+            self.search.transposition_table = self.transposition_table
+        return self.search.search(self.check_whose_turn(), depth=depth, time_ms=time_ms, max_nodes=max_nodes)
+
+    def perft(self, depth: int) -> int:
+        return perft.perft(self.board, depth, self.check_whose_turn(), self.move_generator)
+
+    def divide(self, depth: int) -> dict[Move, int]:
+        return perft.divide(self.board, depth, self.check_whose_turn(), self.move_generator)
+
+    def clear_transposition_table(self) -> None:
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+
+    def close(self) -> None:
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+            self.parallel_search = None
+
     def check_whose_turn(self) -> Color:
-        if len(self.board.movements_history) % 2 == 0:
-            return Color.WHITE
-        return Color.BLACK
+        return Color.BLACK if self.board.is_black_to_move() else Color.WHITE
     
     def __is_checkmate(self, turn, check_handler) -> bool:
         turn = self.check_whose_turn()
-        if turn == Color.WHITE:
-            if self.check_handler.is_checkmate(self.board.get_white_pawns(), turn, check_handler):
-                logger.info(f"The white king is in checkmate! current turn: {turn}")                
-                return True
-            else:
-                logger.info(f"The white king is not in checkmate! current turn: {turn}")                
-                return False
-        elif turn == Color.BLACK:
-            if self.check_handler.is_checkmate(self.board.get_black_pawns(), turn, check_handler):
-                logger.info(f"The black king is in checkmate! current turn: {turn}")                
-                return True
-            else:
-                logger.info(f"The black king is not in checkmate! current turn: {turn}")
-                return False
+        return self.position_cache.get_or_compute((self.board.position_key, turn), "checkmate",
+                                                  lambda: self.__find_checkmate(turn, check_handler))
+
+    def __find_checkmate(self, turn, check_handler) -> bool:
+        if check_handler.is_checkmate(turn):
+            logger.info("The %s king is in checkmate! current turn: %s", turn, turn)
+            return True
+        logger.info("The %s king is not in checkmate! current turn: %s", turn, turn)
+        return False
             
     def __switch_turn(self) -> Color:
         if self.check_whose_turn() == Color.WHITE:
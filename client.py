@@ -1,45 +1,189 @@
-import socket
+import argparse
+import asyncio
+import random
+from collections import deque
+from typing import Any, Optional
+
+from point import Point
+from protocol import FrameDecoder, Message, MessageType, encode_move_message, encode_control_message
 import utils
 
 
 logger = utils.get_logger(__name__)
 
+READ_SIZE = 65536
+RECONNECT_ATTEMPTS = 8
+BACKOFF_BASE = 0.1
+BACKOFF_MAX = 5.0
+
+
+class SessionLost(ConnectionError):
+    pass
+
+
+# Full jitter: a random wait up to the exponential bound, so clients dropped
+# together don't all come back at the same moment
+def backoff_delay(attempt: int, rng: random.Random = random) -> float:
+    return rng.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
 
 class ChessClient:
-    def __init__(self) -> None:
-        self.server_ip = 'localhost'
-        self.server_port = 12345
-        self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-    def connect(self):
-        self.client_socket.connect((self.server_ip, self.server_port))
-        logger.info(f"Connected to server at {self.server_ip}:{self.server_port}")
-
-    def send_data(self, move):
-        self.client_socket.sendall(move.encode())
-        logger.info(f"Sent move: {move}")
-
-    def recv_data(self):
-        response = self.client_socket.recv(1024)
-        response = response.decode()
-        logger.info(f"Received message: {response}")
-        return response
-        
-    def run_client(self):
-        self.connect()
+    # After a dropped connection the client resumes its session with exponential backoff,
+    # ply counts the moves received so far and the server replays only the ones after it
+    def __init__(self, server_ip: str = 'localhost', server_port: int = 12345,
+                 reconnect_attempts: int = RECONNECT_ATTEMPTS) -> None:
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.reconnect_attempts = reconnect_attempts
+        self.room_id: Optional[int] = None
+        self.color: Optional[str] = None
+        self.token: Optional[str] = None
+        self.ply = 0
+        self.reconnects = 0
+        self.__reader: Optional[asyncio.StreamReader] = None
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__decoder = FrameDecoder()
+        self.__received: deque[Message] = deque()
+
+    async def connect(self) -> None:
+        reply = await self.__open({"type": "join"})
+        if reply.type == MessageType.CONTROL and reply.control["type"] == "joined":
+            self.room_id, self.color = reply.control["room"], reply.control["color"]
+            self.token = reply.control["token"]
+
+    async def __open(self, hello: dict[str, Any]) -> Message:
+        self.__reader, self.__writer = await asyncio.open_connection(self.server_ip, self.server_port)
+        logger.info("Connected to server at %s:%s", self.server_ip, self.server_port)
+        self.__decoder = FrameDecoder()
+        await self.__send(encode_control_message(hello))
+        messages = []
+        while not messages:
+            data = await self.__reader.read(READ_SIZE)
+            if not data:
+                raise ConnectionError("Connection closed by the server")
+            messages = self.__decoder.feed(data)
+        reply = messages.pop(0)
+        if reply.type == MessageType.CONTROL and reply.control["type"] == "error":
+            raise SessionLost(reply.control["message"])
+        self.__receive(messages)
+        return reply
+
+    async def reconnect(self) -> None:
+        if self.token is None or self.reconnect_attempts == 0:
+            raise ConnectionError("Connection closed by the server")
+        self.__drop_connection()
+        for attempt in range(self.reconnect_attempts):
+            await asyncio.sleep(backoff_delay(attempt))
+            try:
+                await self.__open({"type": "resume", "token": self.token, "ply": self.ply})
+            except SessionLost:
+                self.token = None
+                raise
+            except OSError as e:
+                logger.info("Reconnect attempt %d failed: %s", attempt + 1, e)
+                self.__drop_connection()
+                continue
+            self.reconnects += 1
+            logger.info("Resumed the session in room %s from ply %d", self.room_id, self.ply)
+            return
+        raise ConnectionError(f"Could not reconnect after {self.reconnect_attempts} attempts")
+
+    async def send_move(self, current_pos: Point, new_pos: Point) -> None:
+        await self.__send_or_resume(encode_move_message(current_pos, new_pos))
+        logger.debug("Sent move: %s -> %s", current_pos, new_pos)
+
+    async def send_control(self, control: dict[str, Any]) -> None:
+        await self.__send_or_resume(encode_control_message(control))
+        logger.debug("Sent control message: %s", control)
+
+    async def recv_message(self) -> Message:
+        while not self.__received:
+            try:
+                data = await self.__reader.read(READ_SIZE)
+            except ConnectionError:
+                data = b""
+            if not data:
+                await self.reconnect()
+                continue
+            self.__receive(self.__decoder.feed(data))
+        message = self.__received.popleft()
+        logger.debug("Received message: %s", message)
+        return message
+
+    def __receive(self, messages: list[Message]) -> None:
+        self.ply += sum(message.type == MessageType.MOVE for message in messages)
+        self.__received.extend(messages)
+
+    # Leaving tells the server not to hold the seat
+    async def close(self) -> None:
+        self.token = None
+        if self.__writer is not None:
+            try:
+                await self.__send(encode_control_message({"type": "leave"}))
+            except ConnectionError:
+                pass
+            self.__writer.close()
+            try:
+                await self.__writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.__writer = None
+
+    def __drop_connection(self) -> None:
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+    async def __send(self, frame: bytes) -> None:
+        if self.__writer is None or self.__writer.is_closing():
+            raise ConnectionError("Not connected")
+        self.__writer.write(frame)
+        await self.__writer.drain()
+
+    # A move or control message lost with the connection is sent again after resuming
+    async def __send_or_resume(self, frame: bytes) -> None:
+        try:
+            await self.__send(frame)
+        except ConnectionError:
+            await self.reconnect()
+            await self.__send(frame)
+
+    async def run_client(self) -> None:
+        await self.connect()
+        print(f"Joined room {self.room_id} as {self.color}")
+        loop = asyncio.get_running_loop()
+        try:
+            receiver = asyncio.create_task(self.__print_messages())
+            while not receiver.done():
+                move = await loop.run_in_executor(None, input, "Enter move (e.g., '12 34'): ")
+                try:
+                    current_pos, new_pos = move.split(" ")
+                    await self.send_move(Point(int(current_pos[0]), int(current_pos[1])),
+                                         Point(int(new_pos[0]), int(new_pos[1])))
+                except (ValueError, IndexError, AttributeError):
+                    logger.warning("Invalid input. Please enter the move in the format '12 34'.")
+        finally:
+            await self.close()
+
+    async def __print_messages(self) -> None:
         while True:
-            response = self.recv_data()
-            if not response:
-                break
-            self.send_data(response)
-        self.client_socket.close()
+            message = await self.recv_message()
+            print(message.move if message.type == MessageType.MOVE else message.control)
 
 
-if __name__ == "__main__":
-    client = ChessClient()
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Connect to a chess server")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=12345)
+    utils.add_logging_arguments(parser)
+    args = parser.parse_args()
+    utils.configure_logging_from_args(args)
+    client = ChessClient(args.host, args.port)
     try:
-        client.run_client()
-    except KeyboardInterrupt:
+        asyncio.run(client.run_client())
+    except (KeyboardInterrupt, EOFError):
         logger.info("Client stopped.")
-    finally:
-        client.client_socket.close()
+
+
+if __name__ == "__main__":
+    main()
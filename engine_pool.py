@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from point import Point
+from pawns import Color
+from board import Board
+from chess_engine import ChessEngine
+from move_generator import Move
+from move_result import MoveResult
+from position_codec import pack_position
+from search import Search
+from transposition_table import TranspositionTable
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+# Requests allowed in flight per worker before callers have to wait
+PENDING_PER_WORKER = 4
+
+# Per-process state of a worker, caches and the transposition table are kept between tasks
+_worker_engine: Optional[ChessEngine] = None
+_worker_search: Optional[Search] = None
+
+
+def _init_worker(tt_size_mb: float) -> None:
+    global _worker_engine, _worker_search
+    _worker_engine = ChessEngine()
+    _worker_search = Search(_worker_engine.board, _worker_engine.move_generator,
+                            transposition_table=TranspositionTable(tt_size_mb))
+
+
+def _load_position(position: bytes) -> Color:
+    _worker_engine.board.load_packed(position)
+    _worker_engine.winner = None
+    return Color.BLACK if _worker_engine.board.is_black_to_move() else Color.WHITE
+
+
+def _validate_move(position: bytes, current_index: int, new_index: int) -> MoveResult:
+    turn = _load_position(position)
+    return _worker_engine.apply_move(Point.from_index(current_index), Point.from_index(new_index), turn)
+
+
+def _best_move(position: bytes, depth: Optional[int], time_ms: Optional[int]) -> Optional[Move]:
+    turn = _load_position(position)
+    return _worker_search.search(turn, depth=depth, time_ms=time_ms).best_move
+
+
+class EnginePool:
+    # Runs CPU-heavy engine calls in worker processes so the event loop only does I/O.
+    # Positions travel in the 33-byte packed format. At most max_pending requests
+    # are in flight, further callers wait for a slot and stop reading their sockets.
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 tt_size_mb: float = 16) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.tt_size_mb = tt_size_mb
+        self.in_flight = 0
+        self.__slots = asyncio.Semaphore(self.max_pending)
+        self.__executor: Optional[ProcessPoolExecutor] = None
+
+    async def validate_move(self, board: Board, turn: Color, current_pos: Point, new_pos: Point) -> MoveResult:
+        return await self.__submit(_validate_move, pack_position(board, turn), current_pos.index, new_pos.index)
+
+    async def best_move(self, board: Board, turn: Color, depth: Optional[int] = None,
+                        time_ms: Optional[int] = None) -> Optional[Move]:
+        return await self.__submit(_best_move, pack_position(board, turn), depth, time_ms)
+
+    def is_saturated(self) -> bool:
+        return self.in_flight >= self.max_pending
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
+
+    async def __submit(self, function, *args):
+        async with self.__slots:
+            self.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.__get_executor(), function, *args)
+            finally:
+                self.in_flight -= 1
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            logger.info("Starting %d engine workers", self.workers)
+            # Spawned, not forked: a forked worker would inherit the server's client sockets
+            # and keep closed connections open
+            self.__executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                  initializer=_init_worker, initargs=(self.tt_size_mb,))
+        return self.__executor
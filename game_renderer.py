@@ -72,7 +72,7 @@ class GameRenderer:
             for x in range(8):
                 pawn_type = self.engine.get_board()[y][x]
                 if isinstance(pawn_type, Pawn):
-                    point = Point(x, y)
+                    point = Point.of(x, y)
                     self.screen.blit(self.pieces[pawn_type.__class__], (self.frame_width + point.x * self.square_width, \
                                                        self.board_height - self.frame_width - self.square_height - point.y * self.square_height))
 
@@ -0,0 +1,38 @@
+import asyncio
+from typing import Optional
+
+from point import Point
+from pawns import Color
+from chess_engine import ChessEngine
+
+
+class GameRoom:
+    def __init__(self, room_id: int) -> None:
+        self.room_id = room_id
+        self.engine = ChessEngine()
+        self.players: dict[Color, asyncio.StreamWriter] = {}
+        self.moves: list[tuple[Point, Point]] = []
+        self.tokens: dict[Color, str] = {}
+        # Seats of dropped players, held until the timer releases them
+        self.held_seats: dict[Color, asyncio.TimerHandle] = {}
+        self.started = False
+
+    def add_player(self, writer: asyncio.StreamWriter, color: Optional[Color] = None) -> Color:
+        color = color or (Color.WHITE if Color.WHITE not in self.players else Color.BLACK)
+        self.players[color] = writer
+        return color
+
+    # Only the connection that holds the seat can leave it, a resumed session replaces it
+    def remove_player(self, color: Color, writer: Optional[asyncio.StreamWriter] = None) -> bool:
+        if writer is not None and self.players.get(color) is not writer:
+            return False
+        return self.players.pop(color, None) is not None
+
+    def opponent_of(self, color: Color) -> Optional[asyncio.StreamWriter]:
+        return self.players.get(Color.BLACK if color == Color.WHITE else Color.WHITE)
+
+    def is_full(self) -> bool:
+        return len(self.players) == 2
+
+    def is_empty(self) -> bool:
+        return not self.players and not self.held_seats
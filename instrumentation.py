@@ -0,0 +1,81 @@
+import time
+from collections import deque
+from typing import Any
+
+
+PHASES = ("validation", "capture", "check")
+LATENCY_WINDOW = 10000
+
+
+class EngineStats:
+    # Plain counters bumped by Board and timers wrapped around ChessEngine.move_piece
+    # phases. Owners keep a None reference while disabled, so the only cost then is
+    # one attribute check per counted call.
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.make_moves = 0
+        self.undo_moves = 0
+        self.check_evaluations = 0
+        self.path_checks = 0
+        self.phase_calls = {phase: 0 for phase in PHASES}
+        self.phase_seconds = {phase: 0.0 for phase in PHASES}
+
+    def phase(self, name: str) -> "PhaseTimer":
+        return PhaseTimer(self, name)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"make_moves": self.make_moves, "undo_moves": self.undo_moves,
+                "check_evaluations": self.check_evaluations, "path_checks": self.path_checks,
+                "phases": {phase: {"calls": self.phase_calls[phase], "seconds": self.phase_seconds[phase]}
+                           for phase in PHASES}}
+
+
+class PhaseTimer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: EngineStats, name: str) -> None:
+        self.stats = stats
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "PhaseTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stats.phase_calls[self.name] += 1
+        self.stats.phase_seconds[self.name] += time.perf_counter() - self.start
+
+
+class LatencyStats:
+    # Count, mean and worst case cover every sample, percentiles the most recent window
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict[str, float]:
+        mean = self.total_seconds / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": mean * 1000, "max_ms": self.max_seconds * 1000,
+                "p50_ms": self.percentile(0.5) * 1000, "p95_ms": self.percentile(0.95) * 1000,
+                "p99_ms": self.percentile(0.99) * 1000}
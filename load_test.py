@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Optional
+
+from pawns import Color
+from chess_engine import ChessEngine
+from client import ChessClient
+from move_result import MoveStatus, MoveResult
+from protocol import Message, MessageType
+from server import ChessServer
+from instrumentation import LatencyStats
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+# Simulated clients only ever talk to a server on this machine
+HOST = "localhost"
+
+
+def _is_control(message: Message, control_type: str) -> bool:
+    return message.type == MessageType.CONTROL and message.control["type"] == control_type
+
+
+class SimulatedPlayer:
+    # Connects, waits for an opponent and plays random legal moves from its own copy of the
+    # game. The round trip of a move is the time until the server's echo of it arrives.
+    def __init__(self, port: int, moves: int, rate: float, rng: random.Random,
+                 connect_latency: LatencyStats, move_latency: LatencyStats) -> None:
+        self.client = ChessClient(HOST, port)
+        self.engine = ChessEngine()
+        self.moves = moves
+        self.rate = rate
+        self.rng = rng
+        self.connect_latency = connect_latency
+        self.move_latency = move_latency
+        self.sent = 0
+        self.checkmated = False
+
+    async def play(self) -> None:
+        start = time.perf_counter()
+        await self.client.connect()
+        self.connect_latency.record(time.perf_counter() - start)
+        try:
+            while not _is_control(await self.client.recv_message(), "start"):
+                pass
+            color = Color.WHITE if self.client.color == "white" else Color.BLACK
+            # Both sides play their moves, white also waits for black's last one
+            while len(self.engine.board.movements_history) < 2 * self.moves:
+                if self.engine.check_whose_turn() == color:
+                    if not await self.__make_move(color):
+                        break
+                elif not await self.__receive_move():
+                    break
+        finally:
+            await self.client.close()
+
+    async def __make_move(self, color: Color) -> bool:
+        legal_moves = list(self.engine.generate_legal_moves(color))
+        if not legal_moves:
+            self.checkmated = self.engine.board.is_in_check(color)
+            return False
+        if self.rate > 0:
+            await asyncio.sleep(1 / self.rate)
+        start = time.perf_counter()
+        await self.client.send_move(*self.rng.choice(legal_moves))
+        if not await self.__receive_move():
+            return False
+        self.move_latency.record(time.perf_counter() - start)
+        self.sent += 1
+        return True
+
+    # Applies the next move the server broadcasts, False once the game is over
+    async def __receive_move(self) -> bool:
+        while True:
+            message = await self.client.recv_message()
+            if message.type == MessageType.MOVE:
+                self.engine.apply_result(MoveResult(MoveStatus.LEGAL, message.move))
+                return True
+            if _is_control(message, "checkmate") or _is_control(message, "opponent_left"):
+                return False
+            if _is_control(message, "illegal"):
+                raise RuntimeError(f"Server rejected a move: {message.control['reason']}")
+
+
+# Runs against the server on the given local port, or starts one in this process
+async def run_load_test(clients: int, moves: int, port: Optional[int] = None, rate: float = 0,
+                        engine_workers: int = 0, seed: Optional[int] = None) -> dict[str, Any]:
+    # An unpaired client would wait for an opponent forever
+    if clients % 2:
+        raise ValueError(f"Clients are paired into games, {clients} is not an even number")
+    server = None
+    if port is None:
+        server = ChessServer(HOST, 0, engine_workers)
+        await server.start()
+        port = server.server_port
+    connect_latency, move_latency = LatencyStats(), LatencyStats()
+    rng = random.Random(seed)
+    players = [SimulatedPlayer(port, moves, rate, random.Random(rng.random()), connect_latency, move_latency)
+               for _ in range(clients)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(player.play() for player in players))
+    finally:
+        if server is not None:
+            await server.stop()
+    elapsed = time.perf_counter() - start
+    total_moves = sum(player.sent for player in players)
+    report = {"clients": clients, "moves": total_moves, "seconds": elapsed,
+              "moves_per_second": total_moves / elapsed if elapsed > 0 else float(total_moves),
+              "checkmates": sum(player.checkmated for player in players),
+              "connect": connect_latency.as_dict(), "round_trip": move_latency.as_dict()}
+    if server is not None:
+        report["server"] = server.stats()
+    return report
+
+
+def _print_report(report: dict[str, Any], indent: str = "") -> None:
+    for name, value in report.items():
+        if isinstance(value, dict):
+            print(f"{indent}{name}")
+            _print_report(value, indent + "  ")
+        else:
+            print(f"{indent}{name:<20} {value:.2f}" if isinstance(value, float) else f"{indent}{name:<20} {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many simulated games against a local chess server")
+    parser.add_argument("--clients", type=int, default=100, help="number of clients, paired into games")
+    parser.add_argument("--moves", type=int, default=20, help="moves per player")
+    parser.add_argument("--rate", type=float, default=0, help="moves per second per player, 0 for no delay")
+    parser.add_argument("--port", type=int, help="local server to test, an in-process server is started by default")
+    parser.add_argument("--engine-workers", type=int, default=0, help="engine worker processes of the in-process server")
+    parser.add_argument("--seed", type=int, help="seed of the random move choices")
+    utils.add_logging_arguments(parser)
+    args = parser.parse_args()
+    if args.clients % 2:
+        parser.error("--clients must be even, clients are paired into games")
+    utils.configure_logging_from_args(args)
+    _print_report(asyncio.run(run_load_test(args.clients, args.moves, args.port, args.rate,
+                                            args.engine_workers, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import argparse
+
 import utils
 from point import Point
 from chess_engine import *
@@ -39,6 +41,9 @@ class ConsoleChess:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Play chess in the console")
+    utils.add_logging_arguments(parser)
+    utils.configure_logging_from_args(parser.parse_args())
     console_chess = ConsoleChess()
     console_chess.run()
 
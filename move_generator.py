@@ -0,0 +1,101 @@
+from typing import Iterator
+
+from point import Point
+from pawns import *
+from bitboard import KNIGHT_OFFSETS, KING_OFFSETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+Move = tuple[Point, Point]
+
+
+class MoveGenerator:
+    def __init__(self, board) -> None:
+        self.board = board
+
+    def generate_legal_moves(self, color: Color) -> Iterator[Move]:
+        pawns = self.board.get_white_pawns() if color == Color.WHITE else self.board.get_black_pawns()
+        for _, position in pawns:
+            pawn = self.board.get_piece(position)
+            if isinstance(pawn, Pawn) and pawn.color == color:
+                yield from self.__legal_moves(pawn, position)
+
+    def legal_moves_from(self, position: Point) -> Iterator[Move]:
+        pawn = self.board.get_piece(position)
+        if isinstance(pawn, Pawn):
+            yield from self.__legal_moves(pawn, position)
+
+    def generate_pseudo_legal_moves(self, pawn: Pawn, position: Point) -> Iterator[Point]:
+        kind = pawn.kind
+        if kind == PAWN:
+            yield from self.__pawn_targets(pawn, position)
+        elif kind == KNIGHT:
+            yield from self.__offset_targets(pawn, position, KNIGHT_OFFSETS)
+        elif kind == KING:
+            yield from self.__offset_targets(pawn, position, KING_OFFSETS)
+        elif kind == BISHOP:
+            yield from self.__ray_targets(pawn, position, BISHOP_DIRECTIONS)
+        elif kind == ROOK:
+            yield from self.__ray_targets(pawn, position, ROOK_DIRECTIONS)
+        elif kind == QUEEN:
+            yield from self.__ray_targets(pawn, position, ROOK_DIRECTIONS + BISHOP_DIRECTIONS)
+
+    def is_legal(self, pawn: Pawn, current_pos: Point, new_pos: Point) -> bool:
+        if pawn.kind == KING:
+            opponent = Color.BLACK if pawn.color == Color.WHITE else Color.WHITE
+            return not self.board.compute_attack_map(opponent) & self.board.square_bit(new_pos)
+        return self.board.get_pin_analysis(pawn.color).allows(current_pos, new_pos)
+
+    def __legal_moves(self, pawn: Pawn, position: Point) -> Iterator[Move]:
+        for new_pos in self.generate_pseudo_legal_moves(pawn, position):
+            if self.is_legal(pawn, position, new_pos):
+                yield position, new_pos
+
+    def __is_on_board(self, x: int, y: int) -> bool:
+        return 0 <= x < self.board.width and 0 <= y < self.board.height
+
+    def __can_land_on(self, pawn: Pawn, target) -> bool:
+        if not isinstance(target, Pawn):
+            return True
+        return target.color != pawn.color and target.kind != KING
+
+    def __offset_targets(self, pawn: Pawn, position: Point, offsets: list[tuple[int, int]]) -> Iterator[Point]:
+        for dx, dy in offsets:
+            x, y = position.x + dx, position.y + dy
+            if self.__is_on_board(x, y):
+                new_pos = Point.of(x, y)
+                if self.__can_land_on(pawn, self.board.get_piece(new_pos)):
+                    yield new_pos
+
+    def __ray_targets(self, pawn: Pawn, position: Point, directions: list[tuple[int, int]]) -> Iterator[Point]:
+        for dx, dy in directions:
+            x, y = position.x + dx, position.y + dy
+            while self.__is_on_board(x, y):
+                new_pos = Point.of(x, y)
+                target = self.board.get_piece(new_pos)
+                if isinstance(target, Pawn):
+                    if self.__can_land_on(pawn, target):
+                        yield new_pos
+                    break
+                yield new_pos
+                x, y = x + dx, y + dy
+
+    def __pawn_targets(self, pawn: Pawn, position: Point) -> Iterator[Point]:
+        direction, start_row = (1, 1) if pawn.color == Color.WHITE else (-1, 6)
+        y = position.y + direction
+        if not self.__is_on_board(position.x, y):
+            return
+        one_step = Point.of(position.x, y)
+        if not isinstance(self.board.get_piece(one_step), Pawn):
+            yield one_step
+            two_steps = Point.of(position.x, y + direction)
+            if position.y == start_row and not isinstance(self.board.get_piece(two_steps), Pawn):
+                yield two_steps
+        for dx in (-1, 1):
+            if self.__is_on_board(position.x + dx, y):
+                new_pos = Point.of(position.x + dx, y)
+                target = self.board.get_piece(new_pos)
+                if isinstance(target, Pawn) and self.__can_land_on(pawn, target):
+                    yield new_pos
@@ -12,7 +12,7 @@ class MoveHandler:
 
     def move_piece(self, current_pos: Point, new_pos: Point, turn, check_handler) -> bool:
         pawn = self.board.get_piece(current_pos)
-        logger.debug(f"Pawn: {pawn} at {current_pos} is moving to {new_pos}")
+        logger.debug("Pawn: %s at %s is moving to %s", pawn, current_pos, new_pos)
         if isinstance(pawn, Pawn):
             if pawn.color != turn:
                 logger.debug("It's not your turn!")
@@ -29,27 +29,35 @@ class MoveHandler:
                 if self.__is_piece_move_valid(pawn, current_pos, new_pos, check_handler, turn):
                     return True
                 else:
-                    logger.debug(f"Invalid piece move")
+                    if utils.TRACE:
+                        logger.debug("Invalid piece move")
             else:
-                logger.debug(f"Target pos is not empty")
+                if utils.TRACE:
+                    logger.debug("Target pos is not empty")
         else:
-            logger.debug(f"{pawn} cannot move")
+            if utils.TRACE:
+                logger.debug("%s cannot move", pawn)
         return False
     
     def __is_piece_move_valid(self, pawn: Pawn, current_pos: Point, new_pos: Point, check_handler, turn) -> bool:
-        if isinstance(pawn, Knight):
+        if pawn.kind == KNIGHT:
             if self.board.is_simulated_action_valid(pawn, current_pos, new_pos, check_handler, turn):
                 return True
             else:
-                logger.debug(f"Simulated action is not valid for Knight")
+                if utils.TRACE:
+                    logger.debug("Simulated action is not valid for Knight")
                 return False
-        elif isinstance(pawn, Pawn) and self.board.is_path_clear(current_pos, new_pos):
-            logger.debug(f"{pawn} has path clear")
+        elif self.board.is_path_clear(current_pos, new_pos):
+            if utils.TRACE:
+                logger.debug("%s has path clear", pawn)
             if self.board.is_simulated_action_valid(pawn, current_pos, new_pos, check_handler, turn):
-                logger.debug(f"Simulated action is valid for {pawn}")
+                if utils.TRACE:
+                    logger.debug("Simulated action is valid for %s", pawn)
                 return True
             else:
-                logger.debug(f"Simulated action not valid for the rest of pawns")
+                if utils.TRACE:
+                    logger.debug("Simulated action not valid for the rest of pawns")
         else:
-            logger.debug(f"Path is not clear")
+            if utils.TRACE:
+                logger.debug("Path is not clear")
         
\ No newline at end of file
@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Optional
+
+from point import Point
+
+
+class MoveStatus(Enum):
+    ILLEGAL = "illegal"
+    LEGAL = "legal"
+    CHECK = "check"
+    CHECKMATE = "checkmate"
+
+
+class MoveResult:
+    def __init__(self, status: MoveStatus, move: Optional[tuple[Point, Point]] = None, reason: str = "") -> None:
+        self.status = status
+        self.move = move
+        self.reason = reason
+
+    @property
+    def accepted(self) -> bool:
+        return self.status != MoveStatus.ILLEGAL
+
+    def __repr__(self) -> str:
+        return f"MoveResult({self.status.name}, move={self.move}, reason={self.reason!r})"
@@ -0,0 +1,154 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from pawns import *
+from board import Board
+from move_generator import MoveGenerator, Move
+from search import Search, SearchResult, MATE_SCORE, INFINITY, MAX_DEPTH
+from transposition_table import TranspositionTable, encode_move, decode_move
+from position_codec import pack_position
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+BOARD_SIZE = 8
+
+class SharedRootBounds:
+    # Best exact root score found so far at every depth, shared by the workers so a move
+    # that cannot beat another worker's best is refuted with a null window
+    def __init__(self, context) -> None:
+        self.scores = context.Array("q", MAX_DEPTH + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        with self.scores.get_lock():
+            self.scores[:] = [-INFINITY] * len(self.scores)
+
+    def get(self, depth: int) -> int:
+        return self.scores[depth]
+
+    def raise_to(self, depth: int, score: int) -> None:
+        with self.scores.get_lock():
+            if score > self.scores[depth]:
+                self.scores[depth] = score
+
+
+# Per-process state of a worker, the transposition table is kept between tasks
+_worker_board: Optional[Board] = None
+_worker_search: Optional[Search] = None
+_worker_bounds: Optional[SharedRootBounds] = None
+
+
+def _init_worker(tt_size_mb: float, root_bounds: SharedRootBounds) -> None:
+    global _worker_board, _worker_search, _worker_bounds
+    _worker_board = Board(BOARD_SIZE, BOARD_SIZE)
+    _worker_search = Search(_worker_board, transposition_table=TranspositionTable(tt_size_mb))
+    _worker_bounds = root_bounds
+
+
+# Returns the encoded best move, score and exactness of every completed depth, and the node count
+def _search_root_moves(position: bytes, moves: list[int], depth: Optional[int], time_ms: Optional[int],
+                       max_nodes: Optional[int]) -> tuple[list[tuple[int, int, bool]], int]:
+    _worker_board.load_packed(position)
+    color = Color.BLACK if _worker_board.is_black_to_move() else Color.WHITE
+    result = _worker_search.search(color, depth=depth, time_ms=time_ms, max_nodes=max_nodes,
+                                   root_moves=[decode_move(move) for move in moves], root_bounds=_worker_bounds)
+    return [(encode_move(move), score, exact) for move, score, exact in result.iterations], result.nodes
+
+
+class ParallelSearch:
+    # Root moves are dealt round-robin to worker processes, each worker searches its
+    # share with its own transposition table. The workers share the best root score of
+    # every depth, and the partial results are compared at the deepest depth all of
+    # them completed, scores of different depths are not comparable.
+    def __init__(self, board: Board, move_generator: Optional[MoveGenerator] = None,
+                 workers: Optional[int] = None, tt_size_mb: float = 16) -> None:
+        self.board = board
+        self.move_generator = move_generator or MoveGenerator(board)
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_size_mb = tt_size_mb
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__root_bounds: Optional[SharedRootBounds] = None
+
+    def search(self, color: Color, depth: Optional[int] = None, time_ms: Optional[int] = None,
+               max_nodes: Optional[int] = None) -> SearchResult:
+        start = time.perf_counter()
+        moves = list(self.move_generator.generate_legal_moves(color))
+        if not moves:
+            score = -MATE_SCORE if self.board.is_in_check(color) else 0
+            return SearchResult(None, score, 0, 0, time.perf_counter() - start)
+        shares = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+        position = pack_position(self.board, color)
+        node_budget = max_nodes // len(shares) if max_nodes else None
+        executor = self.__get_executor()
+        self.__root_bounds.reset()
+        futures = [executor.submit(_search_root_moves, position, [encode_move(move) for move in share],
+                                   depth, time_ms, node_budget) for share in shares]
+        results = [future.result() for future in futures]
+        common_depth = min(len(iterations) for iterations, _ in results)
+        # A score that only failed low against the shared bound never beats the exact one it equals
+        best_move, score, _ = max((iterations[common_depth - 1] for iterations, _ in results),
+                                  key=lambda iteration: (iteration[1], iteration[2]))
+        result = SearchResult(decode_move(best_move), score, common_depth, sum(nodes for _, nodes in results),
+                              time.perf_counter() - start)
+        logger.info("Parallel search with %d workers finished: %s", len(shares), result)
+        return result
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            # Spawned, not forked: inside the server a forked worker would inherit client sockets
+            context = multiprocessing.get_context("spawn")
+            self.__root_bounds = SharedRootBounds(context)
+            self.__executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                                  initargs=(self.tt_size_mb, self.__root_bounds))
+        return self.__executor
+
+    def __enter__(self) -> "ParallelSearch":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+# Fixed-depth searches of the perft benchmark positions with every worker count, the
+# speedup is relative to the first count
+def run_benchmark(depth: int, worker_counts: list[int], positions: Optional[list[str]] = None) -> list[dict[str, object]]:
+    from perft import BENCHMARK_POSITIONS, load_position
+    results = []
+    for workers in worker_counts:
+        seconds, nodes = 0.0, 0
+        for name in positions or BENCHMARK_POSITIONS:
+            board, color = load_position(name)
+            with ParallelSearch(board, workers=workers, tt_size_mb=1) as search:
+                # Started before timing, spawning the workers is not part of the search
+                search.search(color, depth=1)
+                result = search.search(color, depth=depth)
+            seconds += result.elapsed
+            nodes += result.nodes
+        results.append({"workers": workers, "depth": depth, "nodes": nodes, "seconds": seconds,
+                        "speedup": results[0]["seconds"] / seconds if results and seconds > 0 else 1.0})
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure the speedup of the parallel root search")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+    for result in run_benchmark(args.depth, args.workers):
+        print(f"{result['workers']:>2} workers depth {result['depth']} {result['nodes']:>10} nodes "
+              f"{result['seconds']:8.2f}s speedup {result['speedup']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from typing import Any, Callable
 
 from point import Point
+from attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS, \
+    ROOK_LINES, BISHOP_LINES, is_target
 from enum import Enum
 
 
@@ -9,9 +11,24 @@ class Color(Enum):
     BLACK = "black"
 
 
+# Piece kinds shared by both colours, cheaper to dispatch on than isinstance chains
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+_instances: dict[type, "Pawn"] = {}
+
+
 class Pawn:
-    def __init__(self):
-        self.color = None
+    # Pieces are stateless flyweights: every call to a piece class returns the one
+    # shared instance of that type, colour and kind are class attributes
+    __slots__ = ()
+    color = None
+    kind = PAWN
+
+    def __new__(cls):
+        instance = _instances.get(cls)
+        if instance is None:
+            instance = _instances[cls] = super().__new__(cls)
+        return instance
 
     def __eq__(self, other):
         if isinstance(other, Pawn):
@@ -33,171 +50,157 @@ class Pawn:
 
 
 class WhitePawn(Pawn):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WP "
     
     def can_capture(self, current_pos: Point, new_pos: Point) -> bool:
-        return new_pos.y == current_pos.y + 1 and abs(new_pos.x - current_pos.x) == 1
+        return is_target(WHITE_PAWN_ATTACKS, current_pos.index, new_pos.index)
 
 
 class BlackPawn(Pawn):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BP "
     
     def can_capture(self, current_pos: Point, new_pos: Point) -> bool:
-        return new_pos.y == current_pos.y - 1 and abs(new_pos.x - current_pos.x) == 1
+        return is_target(BLACK_PAWN_ATTACKS, current_pos.index, new_pos.index)
 
 
 class Bishop(Pawn):
-    def __init__(self):
-        super().__init__()
-    
+    __slots__ = ()
+    kind = BISHOP
+
     def can_move(self, current_pos: Point, new_pos: Point) -> bool:
-        return is_moving_diagonally(current_pos, new_pos)
+        return is_target(BISHOP_LINES, current_pos.index, new_pos.index)
 
     def can_capture(self, current_pos: Point, new_pos: Point) -> bool:
-        return is_moving_diagonally(current_pos, new_pos)
+        return is_target(BISHOP_LINES, current_pos.index, new_pos.index)
 
 
 class WhiteBishop(Bishop):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WB "
 
 class BlackBishop(Bishop):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BB "
 
 
 class Rook(Pawn):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ()
+    kind = ROOK
 
     def can_move(self, current_pos: Point, new_pos: Point) -> bool:
-        return is_moving_sideways(current_pos, new_pos) or is_moving_forward(self.color, current_pos, new_pos)
+        return is_target(ROOK_LINES, current_pos.index, new_pos.index)
 
     def can_capture(self, current_pos: Point, new_pos: Point):
         return self.can_move(current_pos, new_pos)
 
 
 class WhiteRook(Rook):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WR "
 
 
 class BlackRook(Rook):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BR "
 
 
 class Knight(Pawn):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ()
+    kind = KNIGHT
 
     def can_move(self, current_pos: Point, new_pos: Point) -> bool:
-        return (abs(new_pos.x - current_pos.x) == 2 and abs(new_pos.y - current_pos.y) == 1) or \
-        (abs(new_pos.x - current_pos.x) == 1 and abs(new_pos.y - current_pos.y) == 2)
+        return is_target(KNIGHT_ATTACKS, current_pos.index, new_pos.index)
 
     def can_capture(self, current_pos: Point, new_pos: Point) -> bool:
         return self.can_move(current_pos, new_pos)
 
 
 class WhiteKnight(Knight):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WKn"
 
 
 class BlackKnight(Knight):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BKn"
 
 
 class Queen(Pawn):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ()
+    kind = QUEEN
 
     def can_move(self, current_pos: Point, new_pos: Point) -> bool:
-        return is_moving_diagonally(current_pos, new_pos) or \
-                is_moving_forward(self.color, current_pos, new_pos) or \
-                is_moving_sideways(current_pos, new_pos)
+        current_square, new_square = current_pos.index, new_pos.index
+        return is_target(ROOK_LINES, current_square, new_square) or is_target(BISHOP_LINES, current_square, new_square)
 
     def can_capture(self, current_pos: Point, new_pos: Point):
         return self.can_move(current_pos, new_pos)
 
 
 class WhiteQueen(Queen):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WQ "
 
 
 class BlackQueen(Queen):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BQ "
 
 
 class King(Pawn):
-    def __init__(self):
-        super().__init__()
-      
+    __slots__ = ()
+    kind = KING
+
     def can_move(self, current_pos: Point, new_pos: Point) -> bool:
-        return abs(new_pos.x - current_pos.x) <= 1 and abs(new_pos.y - current_pos.y) <= 1
+        return is_target(KING_ATTACKS, current_pos.index, new_pos.index)
 
     def can_capture(self, current_pos: Point, new_pos: Point):
         return self.can_move(current_pos, new_pos)
 
 
 class WhiteKing(King):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.WHITE
+    __slots__ = ()
+    color = Color.WHITE
 
     def __str__(self):
         return "WK "
 
 
 class BlackKing(King):
-    def __init__(self):
-        super().__init__()
-        self.color = Color.BLACK
+    __slots__ = ()
+    color = Color.BLACK
 
     def __str__(self):
         return "BK "
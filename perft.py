@@ -0,0 +1,173 @@
+import argparse
+import time
+from typing import Iterator, Optional
+
+from point import Point
+from pawns import *
+from board import Board
+from position_codec import parse_placement
+from move_generator import MoveGenerator, Move
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+# Piece placement (rank 8 first), side to move and known node counts per depth. The engine
+# has no castling, en passant or promotion, so reference counts are listed only for depths
+# at which none of them can occur yet.
+BENCHMARK_POSITIONS: dict[str, tuple[str, bool, dict[int, int]]] = {
+    "initial": ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR", False, {1: 20, 2: 400, 3: 8902, 4: 197281}),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R", False, {}),
+    "endgame": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8", False, {1: 14, 2: 191}),
+    "middlegame": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1", False,
+                   {1: 46, 2: 2079, 3: 89890}),
+}
+
+
+class HandlerMoveGenerator:
+    # Brute-force move source that asks the engine's handlers about every square,
+    # slow but independent of MoveGenerator, so perft can compare the two
+    def __init__(self, engine) -> None:
+        self.board = engine.board
+        self.capture_handler = engine.capture_handler
+        self.check_handler = engine.check_handler
+
+    def generate_legal_moves(self, color: Color) -> Iterator[Move]:
+        pawns = self.board.get_white_pawns() if color == Color.WHITE else self.board.get_black_pawns()
+        for _, current_pos in list(pawns):
+            pawn = self.board.get_piece(current_pos)
+            for y in range(self.board.height):
+                for x in range(self.board.width):
+                    new_pos = Point.of(x, y)
+                    if new_pos != current_pos and self.__is_move_valid(pawn, current_pos, new_pos, color):
+                        yield current_pos, new_pos
+
+    def __is_move_valid(self, pawn: Pawn, current_pos: Point, new_pos: Point, color: Color) -> bool:
+        target = self.board.get_piece(new_pos)
+        if isinstance(target, King):
+            return False
+        if isinstance(target, Pawn):
+            return self.capture_handler.is_capture_valid(pawn, current_pos, new_pos, self.check_handler, color)
+        return pawn.can_move(current_pos, new_pos) \
+            and (isinstance(pawn, Knight) or self.board.is_path_clear(current_pos, new_pos)) \
+            and self.board.is_simulated_action_valid(pawn, current_pos, new_pos, self.check_handler, color)
+
+
+def _opponent(color: Color) -> Color:
+    return Color.BLACK if color == Color.WHITE else Color.WHITE
+
+
+def _position_pieces(name: str) -> tuple[list[tuple[type, Point]], bool]:
+    placement, black_to_move, _ = BENCHMARK_POSITIONS[name]
+    return parse_placement(placement), black_to_move
+
+
+def load_position(name: str) -> tuple[Board, Color]:
+    pieces, black_to_move = _position_pieces(name)
+    board = Board(8, 8)
+    board.set_position(pieces, black_to_move)
+    return board, Color.BLACK if black_to_move else Color.WHITE
+
+
+# move_generator is anything with generate_legal_moves(color), MoveGenerator by default
+def perft(board: Board, depth: int, color: Color, move_generator: Optional[MoveGenerator] = None) -> int:
+    move_generator = move_generator or MoveGenerator(board)
+    return _count_nodes(board, move_generator, depth, color)
+
+
+# Node count of the subtree below every root move
+def divide(board: Board, depth: int, color: Color,
+           move_generator: Optional[MoveGenerator] = None) -> dict[Move, int]:
+    move_generator = move_generator or MoveGenerator(board)
+    counts = {}
+    for current_pos, new_pos in list(move_generator.generate_legal_moves(color)):
+        counts[(current_pos, new_pos)] = _count_after_move(board, move_generator, depth - 1, color,
+                                                           current_pos, new_pos)
+    return counts
+
+
+def _count_nodes(board: Board, move_generator: MoveGenerator, depth: int, color: Color) -> int:
+    if depth == 0:
+        return 1
+    moves = list(move_generator.generate_legal_moves(color))
+    if depth == 1:
+        return len(moves)
+    return sum(_count_after_move(board, move_generator, depth - 1, color, current_pos, new_pos)
+               for current_pos, new_pos in moves)
+
+
+def _count_after_move(board: Board, move_generator: MoveGenerator, depth: int, color: Color,
+                      current_pos: Point, new_pos: Point) -> int:
+    pawn = board.get_piece(current_pos)
+    original_target = board.get_piece(new_pos)
+    board.make_move(pawn, new_pos, current_pos)
+    try:
+        return _count_nodes(board, move_generator, depth, _opponent(color))
+    finally:
+        board.undo_move(pawn, current_pos, new_pos, original_target)
+
+
+def run_benchmark(depth: int, positions: Optional[list[str]] = None) -> list[dict[str, object]]:
+    results = []
+    for name in positions or BENCHMARK_POSITIONS:
+        board, color = load_position(name)
+        start = time.perf_counter()
+        nodes = perft(board, depth, color)
+        elapsed = time.perf_counter() - start
+        expected = BENCHMARK_POSITIONS[name][2].get(depth)
+        results.append({"position": name, "depth": depth, "nodes": nodes, "expected": expected,
+                        "seconds": elapsed, "nodes_per_second": nodes / elapsed if elapsed > 0 else float(nodes)})
+    return results
+
+
+def _format_square(position: Point) -> str:
+    return f"{chr(ord('a') + position.x)}{position.y + 1}"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count leaf nodes of the legal move tree")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--position", choices=sorted(BENCHMARK_POSITIONS), default="initial")
+    parser.add_argument("--divide", action="store_true", help="print the node count below every root move")
+    parser.add_argument("--handlers", action="store_true",
+                        help="generate moves through the engine's move, capture and check handlers")
+    parser.add_argument("--bench", action="store_true", help="run every benchmark position and report nodes/second")
+    utils.add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    utils.configure_logging_from_args(args)
+
+    if args.bench:
+        failed = False
+        for result in run_benchmark(args.depth):
+            status = ""
+            if result["expected"] is not None:
+                status = "ok" if result["nodes"] == result["expected"] else f"expected {result['expected']}"
+                failed |= status != "ok"
+            print(f"{result['position']:<12} depth {result['depth']} {result['nodes']:>10} nodes "
+                  f"{result['seconds']:8.2f}s {result['nodes_per_second']:>10.0f} nodes/s {status}")
+        return 1 if failed else 0
+
+    board, color = load_position(args.position)
+    move_generator = None
+    if args.handlers:
+        from chess_engine import ChessEngine
+        engine = ChessEngine()
+        board = engine.board
+        board.set_position(*_position_pieces(args.position))
+        move_generator = HandlerMoveGenerator(engine)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth, color, move_generator)
+        for (current_pos, new_pos), nodes in sorted(counts.items(), key=lambda item: repr(item[0])):
+            print(f"{_format_square(current_pos)}{_format_square(new_pos)}: {nodes}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, args.depth, color, move_generator)
+    elapsed = time.perf_counter() - start
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.2f}s, {nodes / elapsed if elapsed > 0 else nodes:.0f} nodes/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from typing import Iterator, Optional
+
+from point import Point
+
+
+class PieceIndex:
+    # Piece list with a square-indexed lookup table, every operation is O(1).
+    # Moving a piece keeps its slot in the list and restore() puts a removed
+    # piece back in its slot, so iterating while simulating moves is safe.
+    def __init__(self, width: int, height: int, pieces: list[tuple[type, Point]]) -> None:
+        self.width = width
+        self.__squares: list[Optional[int]] = [None] * (width * height)
+        self.__pieces: list[tuple[type, Point]] = []
+        for piece_type, position in pieces:
+            self.add(piece_type, position)
+
+    def __square(self, position: Point) -> int:
+        return position.y * self.width + position.x
+
+    def __iter__(self) -> Iterator[tuple[type, Point]]:
+        return iter(self.__pieces)
+
+    def __len__(self) -> int:
+        return len(self.__pieces)
+
+    def __contains__(self, item: tuple[type, Point]) -> bool:
+        piece_type, position = item
+        return self.get(position) is piece_type
+
+    def __repr__(self) -> str:
+        return f"PieceIndex({self.__pieces})"
+
+    def get(self, position: Point) -> Optional[type]:
+        slot = self.__squares[self.__square(position)]
+        if slot is None:
+            return None
+        return self.__pieces[slot][0]
+
+    def add(self, piece_type: type, position: Point) -> None:
+        square = self.__square(position)
+        if self.__squares[square] is not None:
+            raise ValueError(f"Square {position} is already taken")
+        self.__squares[square] = len(self.__pieces)
+        self.__pieces.append((piece_type, position))
+
+    def move(self, current_pos: Point, new_pos: Point) -> None:
+        current_square = self.__square(current_pos)
+        slot = self.__squares[current_square]
+        if slot is None:
+            raise ValueError(f"There is no piece at {current_pos}")
+        new_square = self.__square(new_pos)
+        if self.__squares[new_square] is not None:
+            raise ValueError(f"Square {new_pos} is already taken")
+        self.__squares[current_square] = None
+        self.__squares[new_square] = slot
+        self.__pieces[slot] = (self.__pieces[slot][0], new_pos)
+
+    def remove(self, position: Point) -> int:
+        square = self.__square(position)
+        slot = self.__squares[square]
+        if slot is None:
+            raise ValueError(f"There is no piece at {position}")
+        last = self.__pieces.pop()
+        self.__squares[square] = None
+        if slot < len(self.__pieces):
+            self.__pieces[slot] = last
+            self.__squares[self.__square(last[1])] = slot
+        return slot
+
+    # Reverses remove() when called in LIFO order, the piece gets its old slot back
+    def restore(self, piece_type: type, position: Point, slot: int) -> None:
+        square = self.__square(position)
+        if self.__squares[square] is not None:
+            raise ValueError(f"Square {position} is already taken")
+        if slot < len(self.__pieces):
+            occupant = self.__pieces[slot]
+            self.__squares[self.__square(occupant[1])] = len(self.__pieces)
+            self.__pieces.append(occupant)
+            self.__pieces[slot] = (piece_type, position)
+        else:
+            self.__pieces.append((piece_type, position))
+        self.__squares[square] = slot
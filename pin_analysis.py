@@ -0,0 +1,90 @@
+from typing import Optional
+
+from point import Point
+from pawns import *
+from bitboard import KNIGHT_OFFSETS, KING_OFFSETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS
+
+
+ALL_SQUARES = -1
+
+
+class PinAnalysis:
+    def __init__(self, width: int, checkers: list[Point], check_mask: int, pins: dict[Point, int]) -> None:
+        self.width = width
+        self.checkers = checkers
+        # Squares a non-king move has to land on to resolve the check, every square if there is no check
+        self.check_mask = check_mask
+        # Pinned piece position -> squares between the king and the pinner, pinner included
+        self.pins = pins
+
+    def is_check(self) -> bool:
+        return len(self.checkers) > 0
+
+    def is_double_check(self) -> bool:
+        return len(self.checkers) > 1
+
+    # Legality of a move made by any piece other than the king
+    def allows(self, current_pos: Point, new_pos: Point) -> bool:
+        bit = 1 << (new_pos.y * self.width + new_pos.x)
+        if not self.check_mask & bit:
+            return False
+        pin = self.pins.get(current_pos)
+        return pin is None or bool(pin & bit)
+
+
+def analyze_pins(board, color: Color) -> PinAnalysis:
+    king_pos = board.king_positions.get(color)
+    if king_pos is None:
+        return PinAnalysis(board.width, [], ALL_SQUARES, {})
+    checkers: list[Point] = []
+    check_mask = ALL_SQUARES
+    pins: dict[Point, int] = {}
+    for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+        sliders = (Rook, Queen) if direction in ROOK_DIRECTIONS else (Bishop, Queen)
+        check_ray = _scan_ray(board, color, king_pos, direction, sliders, checkers, pins)
+        if check_ray is not None:
+            check_mask &= check_ray
+    for dx, dy in KNIGHT_OFFSETS:
+        check_mask = _check_offset(board, color, king_pos, dx, dy, Knight, checkers, check_mask)
+    pawn_direction = 1 if color == Color.WHITE else -1
+    for dx in (-1, 1):
+        check_mask = _check_offset(board, color, king_pos, dx, pawn_direction, (WhitePawn, BlackPawn),
+                                   checkers, check_mask)
+    for dx, dy in KING_OFFSETS:
+        check_mask = _check_offset(board, color, king_pos, dx, dy, King, checkers, check_mask)
+    return PinAnalysis(board.width, checkers, check_mask, pins)
+
+
+def _scan_ray(board, color: Color, king_pos: Point, direction: tuple[int, int], sliders: tuple,
+              checkers: list[Point], pins: dict[Point, int]) -> Optional[int]:
+    dx, dy = direction
+    x, y = king_pos.x + dx, king_pos.y + dy
+    ray_mask, blocker = 0, None
+    while 0 <= x < board.width and 0 <= y < board.height:
+        ray_mask |= 1 << (y * board.width + x)
+        piece = board.board[y][x]
+        if isinstance(piece, Pawn):
+            if piece.color == color:
+                if blocker is not None:
+                    break
+                blocker = Point.of(x, y)
+            else:
+                if isinstance(piece, sliders):
+                    if blocker is None:
+                        checkers.append(Point.of(x, y))
+                        return ray_mask
+                    pins[blocker] = ray_mask
+                break
+        x, y = x + dx, y + dy
+    return None
+
+
+def _check_offset(board, color: Color, king_pos: Point, dx: int, dy: int, attacker_type,
+                  checkers: list[Point], check_mask: int) -> int:
+    x, y = king_pos.x + dx, king_pos.y + dy
+    if 0 <= x < board.width and 0 <= y < board.height:
+        piece = board.board[y][x]
+        if isinstance(piece, attacker_type) and piece.color != color:
+            checkers.append(Point.of(x, y))
+            return check_mask & (1 << (y * board.width + x))
+    return check_mask
@@ -1,15 +1,57 @@
+BOARD_SIZE = 8
+
+
 class Point:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    # Immutable and interned: squares of the 8x8 board come from a 64-entry table,
+    # so Point(x, y), Point.of(x, y) and Point.from_index(i) return the same object
+    # and equality usually short-circuits on identity. Off-board points are plain instances.
+    __slots__ = ("x", "y", "index", "_hash")
+
+    def __new__(cls, x, y):
+        on_board = 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE and type(x) is int and type(y) is int
+        if on_board and _SQUARES:
+            return _SQUARES[y * BOARD_SIZE + x]
+        point = object.__new__(cls)
+        object.__setattr__(point, "x", x)
+        object.__setattr__(point, "y", y)
+        # Square index on the 8x8 board, -1 for points off the board
+        object.__setattr__(point, "index", y * BOARD_SIZE + x if on_board else -1)
+        object.__setattr__(point, "_hash", hash((x, y)))
+        return point
+
+    @staticmethod
+    def of(x: int, y: int) -> "Point":
+        if 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE:
+            return _SQUARES[y * BOARD_SIZE + x]
+        return Point(x, y)
+
+    @staticmethod
+    def from_index(index: int) -> "Point":
+        return _SQUARES[index]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Point is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Point is immutable")
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, Point):
             return self.x == other.x and self.y == other.y
         return False
 
     def __hash__(self):
-        return hash((self.x, self.y))
-    
+        return self._hash
+
     def __repr__(self) -> str:
         return f"Point({self.x}, {self.y})"
+
+
+# Empty while the table itself is built, so the constructor creates the instances
+_SQUARES: list[Point] = []
+_SQUARES = [Point(index % BOARD_SIZE, index // BOARD_SIZE) for index in range(BOARD_SIZE * BOARD_SIZE)]
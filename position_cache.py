@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class PositionCache:
+    # Bounded LRU cache of per-position results (check status, checkmate, legal moves).
+    # Keys include Board.position_key, which changes on every board mutation, so
+    # entries of a position that was left can never be returned for another one.
+    def __init__(self, max_size: int = 4096) -> None:
+        if max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get_or_compute(self, key: Hashable, field: str, compute: Callable[[], Any]) -> Any:
+        entry = self.__entries.get(key)
+        if entry is not None and field in entry:
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return entry[field]
+        self.misses += 1
+        value = compute()
+        self.put(key, field, value)
+        return value
+
+    def put(self, key: Hashable, field: str, value: Any) -> None:
+        if self.max_size == 0:
+            return
+        entry = self.__entries.get(key)
+        if entry is None:
+            entry = self.__entries[key] = {}
+            if len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+        else:
+            self.__entries.move_to_end(key)
+        entry[field] = value
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {"size": len(self.__entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
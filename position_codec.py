@@ -0,0 +1,205 @@
+import argparse
+import random
+import time
+from operator import getitem
+from typing import Optional
+
+from point import Point
+from pawns import *
+import zobrist
+
+
+BOARD_SIZE = 8
+SQUARES = BOARD_SIZE * BOARD_SIZE
+# 32 bytes of square nibbles, two squares per byte, followed by one byte of flags
+PACKED_SIZE = SQUARES // 2 + 1
+BLACK_TO_MOVE = 0x01
+FEN_LETTERS = "PNBRQKpnbrqk"
+INITIAL_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+
+# Square codes shared by both formats, 0 is an empty square
+PIECE_CODES = {piece_type: code for code, piece_type in enumerate(zobrist.PIECE_TYPES, start=1)}
+CODE_TYPES = [None] + zobrist.PIECE_TYPES
+LETTER_TYPES = {letter: piece_type for letter, piece_type in zip(FEN_LETTERS, zobrist.PIECE_TYPES)}
+TYPE_LETTERS = {piece_type: letter for letter, piece_type in LETTER_TYPES.items()}
+# Digits of a FEN rank expand to that many "." before the placement is parsed
+EXPAND_DIGITS = tuple((str(run), "." * run) for run in range(1, BOARD_SIZE + 1))
+
+
+# A placement with its digits expanded is always 71 characters: 8 ranks of 8 squares,
+# rank 8 first, with a "/" after each of the first seven. Every character position gets
+# a table from the character found there to the (piece type, point) it stands for, and
+# None for "." and "/", so parsing is a lookup per character.
+def _placement_tables() -> list[dict[str, Optional[tuple[type, Point]]]]:
+    tables = []
+    for y in range(BOARD_SIZE - 1, -1, -1):
+        for x in range(BOARD_SIZE):
+            table = {".": None}
+            for letter, piece_type in LETTER_TYPES.items():
+                table[letter] = (piece_type, Point.of(x, y))
+            tables.append(table)
+        if y > 0:
+            tables.append({"/": None})
+    return tables
+
+
+PLACEMENT_TABLES = _placement_tables()
+
+
+class PositionError(ValueError):
+    pass
+
+
+def board_squares(board) -> bytearray:
+    squares = bytearray(SQUARES)
+    for pawns in (board.get_white_pawns(), board.get_black_pawns()):
+        for piece_type, position in pawns:
+            squares[position.index] = PIECE_CODES[piece_type]
+    return squares
+
+
+def _placement_error(placement: str, expanded: str) -> PositionError:
+    ranks = expanded.split("/")
+    if len(ranks) != BOARD_SIZE:
+        return PositionError(f"FEN placement needs {BOARD_SIZE} ranks, got {len(ranks)}")
+    for rank in ranks:
+        if len(rank) != BOARD_SIZE:
+            return PositionError(f"FEN rank {rank!r} does not describe {BOARD_SIZE} squares")
+    invalid = sorted(set(expanded) - set(FEN_LETTERS) - {".", "/"})
+    return PositionError(f"Invalid characters {''.join(invalid)!r} in FEN placement {placement!r}")
+
+
+def parse_placement(placement: str) -> list[tuple[type, Point]]:
+    expanded = placement
+    for digit, run in EXPAND_DIGITS:
+        expanded = expanded.replace(digit, run)
+    if len(expanded) != len(PLACEMENT_TABLES):
+        raise _placement_error(placement, expanded)
+    try:
+        # Looks each character up in the table of its position and drops the empty squares
+        return list(filter(None, map(getitem, PLACEMENT_TABLES, expanded)))
+    except KeyError:
+        raise _placement_error(placement, expanded) from None
+
+
+# Castling and en passant are not part of the game, those fields and the move
+# counters are accepted and ignored
+def parse_fen(fen: str) -> tuple[list[tuple[type, Point]], bool]:
+    fields = fen.split()
+    if not fields:
+        raise PositionError("Empty FEN")
+    side = fields[1] if len(fields) > 1 else "w"
+    if side not in ("w", "b"):
+        raise PositionError(f"Invalid side to move {side!r}")
+    return parse_placement(fields[0]), side == "b"
+
+
+# rows is the board's grid, row 0 is rank 1. Anything that is not a piece is an empty square.
+def rows_to_fen(rows: list[list], black_to_move: bool, fullmove: int = 1) -> str:
+    ranks = []
+    for row in reversed(rows):
+        rank, empty = "", 0
+        for piece in row:
+            letter = TYPE_LETTERS.get(type(piece))
+            if letter is None:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += letter
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+    return f"{'/'.join(ranks)} {'b' if black_to_move else 'w'} - - 0 {fullmove}"
+
+
+# Even squares go to the high nibbles: every code is below 16, so shifting the whole
+# 32-byte number by 4 moves each one into the upper half of its own byte
+def pack_squares(squares: bytes, black_to_move: bool) -> bytes:
+    packed = int.from_bytes(squares[0::2], "big") << 4 | int.from_bytes(squares[1::2], "big")
+    return packed.to_bytes(SQUARES // 2, "big") + (BLACK_TO_MOVE if black_to_move else 0).to_bytes(1, "big")
+
+
+def pack_position(board, color: Color) -> bytes:
+    return pack_squares(board_squares(board), color == Color.BLACK)
+
+
+# Accepts any bytes-like object, socket reads and FrameDecoder hand out bytearrays and memoryviews
+def unpack_position(data: bytes) -> tuple[list[tuple[type, Point]], bool]:
+    if len(data) != PACKED_SIZE:
+        raise PositionError(f"Packed position must be {PACKED_SIZE} bytes, got {len(data)}")
+    pieces = []
+    try:
+        for index, byte in enumerate(data[:SQUARES // 2]):
+            high, low = byte >> 4, byte & 0x0F
+            if high:
+                pieces.append((CODE_TYPES[high], Point.from_index(2 * index)))
+            if low:
+                pieces.append((CODE_TYPES[low], Point.from_index(2 * index + 1)))
+    except IndexError:
+        raise PositionError("Invalid piece code in packed position") from None
+    return pieces, bool(data[-1] & BLACK_TO_MOVE)
+
+
+# Positions reached by random play from the initial one, so the benchmarks decode and
+# emit varied material rather than a single position over and over
+def random_game_positions(count: int, seed: int = 0, max_plies: int = 80) -> list[bytes]:
+    from chess_engine import ChessEngine
+    rng = random.Random(seed)
+    positions: dict[bytes, None] = {}
+    while len(positions) < count:
+        engine = ChessEngine()
+        for _ in range(max_plies):
+            color = engine.check_whose_turn()
+            legal_moves = list(engine.generate_legal_moves(color))
+            if not legal_moves or len(positions) >= count:
+                break
+            engine.apply_move(*rng.choice(legal_moves))
+            positions[engine.board.pack()] = None
+    return list(positions)
+
+
+def run_benchmark(count: int, positions: int = 1000, seed: int = 0) -> dict[str, float]:
+    from board import Board
+    packed = random_game_positions(positions, seed)
+    boards = []
+    for data in packed:
+        board = Board(8, 8)
+        board.load_packed(data)
+        boards.append(board)
+    fens = [board.to_fen() for board in boards]
+    loaded = Board(8, 8)
+    benchmarks = {
+        "fen_parse": (parse_fen, fens),
+        "fen_emit": (Board.to_fen, boards),
+        "pack": (Board.pack, boards),
+        "unpack": (unpack_position, packed),
+        "load_packed": (loaded.load_packed, packed),
+    }
+    results = {}
+    for name, (benchmark, inputs) in benchmarks.items():
+        rounds, rest = divmod(count, len(inputs))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in inputs:
+                benchmark(item)
+        for item in inputs[:rest]:
+            benchmark(item)
+        elapsed = time.perf_counter() - start
+        results[name] = count / elapsed if elapsed > 0 else float(count)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure position encoding and decoding rates")
+    parser.add_argument("--count", type=int, default=100000, help="conversions per benchmark")
+    parser.add_argument("--positions", type=int, default=1000, help="distinct positions from random games")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random games")
+    args = parser.parse_args(argv)
+    for name, rate in run_benchmark(args.count, args.positions, args.seed).items():
+        print(f"{name:<12} {rate:>12.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
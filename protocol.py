@@ -0,0 +1,96 @@
+import json
+import struct
+from enum import IntEnum
+from typing import Any, Optional
+
+from point import Point
+
+
+# Frame: 2-byte big-endian length of the rest, 1-byte message type, body
+HEADER = struct.Struct("!HB")
+MAX_FRAME_SIZE = 4096
+SQUARES = 64
+
+
+class MessageType(IntEnum):
+    MOVE = 1
+    CONTROL = 2
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class Message:
+    __slots__ = ("type", "move", "control")
+
+    def __init__(self, message_type: MessageType, move: Optional[tuple[Point, Point]] = None,
+                 control: Optional[dict[str, Any]] = None) -> None:
+        self.type = message_type
+        self.move = move
+        self.control = control
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Message):
+            return (self.type, self.move, self.control) == (other.type, other.move, other.control)
+        return False
+
+    def __repr__(self) -> str:
+        return f"Message({self.type.name}, move={self.move}, control={self.control})"
+
+
+def _frame(message_type: MessageType, body: bytes) -> bytes:
+    if len(body) + 1 > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Message of {len(body)} bytes is too long")
+    return HEADER.pack(len(body) + 1, message_type) + body
+
+
+# A move is the from and to square indexes, one byte each
+def encode_move_message(current_pos: Point, new_pos: Point) -> bytes:
+    return _frame(MessageType.MOVE, bytes((current_pos.index, new_pos.index)))
+
+
+def encode_control_message(control: dict[str, Any]) -> bytes:
+    return _frame(MessageType.CONTROL, json.dumps(control, separators=(",", ":")).encode())
+
+
+class FrameDecoder:
+    # Accumulates received chunks and cuts complete frames out of the buffer, partial
+    # frames stay buffered until the rest arrives. Frames are read through a memoryview
+    # and the consumed prefix is dropped once per feed.
+    def __init__(self) -> None:
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[Message]:
+        self.__buffer += data
+        messages, offset = [], 0
+        with memoryview(self.__buffer) as view:
+            while len(view) - offset >= HEADER.size:
+                length, message_type = HEADER.unpack_from(view, offset)
+                if not 0 < length <= MAX_FRAME_SIZE:
+                    raise ProtocolError(f"Invalid frame length {length}")
+                end = offset + 2 + length
+                if end > len(view):
+                    break
+                messages.append(self.__decode(message_type, view[offset + HEADER.size:end]))
+                offset = end
+        del self.__buffer[:offset]
+        return messages
+
+    def pending(self) -> int:
+        return len(self.__buffer)
+
+    def __decode(self, message_type: int, body: memoryview) -> Message:
+        if message_type == MessageType.MOVE:
+            if len(body) != 2 or body[0] >= SQUARES or body[1] >= SQUARES:
+                raise ProtocolError("Invalid move message")
+            return Message(MessageType.MOVE, move=(Point.from_index(body[0]), Point.from_index(body[1])))
+        if message_type == MessageType.CONTROL:
+            try:
+                control = json.loads(body.tobytes())
+            except ValueError as e:
+                raise ProtocolError(f"Invalid control message: {e}") from e
+            if not isinstance(control, dict) or "type" not in control:
+                raise ProtocolError("Control message must be an object with a type")
+            return Message(MessageType.CONTROL, control=control)
+        raise ProtocolError(f"Unknown message type {message_type}")
@@ -0,0 +1,221 @@
+import time
+from typing import Optional
+
+from pawns import *
+from bitboard import PIECE_TYPES
+from move_generator import MoveGenerator, Move
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+import utils
+
+
+logger = utils.get_logger(__name__)
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+DEFAULT_DEPTH = 3
+MAX_DEPTH = 64
+# How many nodes are searched between two checks of the time and node budget
+BUDGET_CHECK_INTERVAL = 1024
+
+PIECE_VALUES = {"pawn": 100, "knight": 320, "bishop": 330, "rook": 500, "queen": 900, "king": 0}
+VALUES = {piece_type: PIECE_VALUES[name] for types in PIECE_TYPES.values() for name, piece_type in types.items()}
+# Small bonus for pieces and pawns that control the centre
+CENTER_BONUS = [0, 2, 4, 6, 6, 4, 2, 0]
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, best_move: Optional[Move], score: int, depth: int, nodes: int, elapsed: float,
+                 iterations: Optional[list[tuple[Optional[Move], int, bool]]] = None) -> None:
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        # Best move, score and whether the score is exact for every completed depth
+        self.iterations = iterations or []
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else float(self.nodes)
+
+    def __repr__(self) -> str:
+        return f"SearchResult(best_move={self.best_move}, score={self.score}, depth={self.depth}, " \
+               f"nodes={self.nodes}, nps={self.nodes_per_second:.0f})"
+
+
+class Search:
+    def __init__(self, board, move_generator: Optional[MoveGenerator] = None,
+                 transposition_table: Optional[TranspositionTable] = None) -> None:
+        self.board = board
+        self.move_generator = move_generator or MoveGenerator(board)
+        self.transposition_table = transposition_table
+        self.nodes = 0
+        self.__killers: list[list[Move]] = []
+        self.__deadline: Optional[float] = None
+        self.__max_nodes: Optional[int] = None
+
+    # root_bounds is shared by searches of disjoint root_moves subsets: get(depth) is the best
+    # exact root score any of them has found at that depth, raise_to(depth, score) publishes one
+    def search(self, color: Color, depth: Optional[int] = None, time_ms: Optional[int] = None,
+               max_nodes: Optional[int] = None, root_moves: Optional[list[Move]] = None,
+               root_bounds=None) -> SearchResult:
+        max_depth = depth or (MAX_DEPTH if time_ms or max_nodes else DEFAULT_DEPTH)
+        start = time.perf_counter()
+        self.nodes = 0
+        self.__killers = [[] for _ in range(max_depth + 1)]
+        self.__deadline = None
+        self.__max_nodes = None
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        result, iterations = SearchResult(None, 0, 0, 0, 0.0), []
+        for current_depth in range(1, max_depth + 1):
+            try:
+                best_move, score, exact = self.__search_root(color, current_depth, result.best_move, root_moves,
+                                                             root_bounds)
+            except SearchTimeout:
+                break
+            iterations.append((best_move, score, exact))
+            result = SearchResult(best_move, score, current_depth, self.nodes, time.perf_counter() - start,
+                                  iterations)
+            logger.debug("Depth %d: %s", current_depth, result)
+            if best_move is None or abs(score) >= MATE_SCORE - MAX_DEPTH:
+                break
+            # The first iteration always completes so there is a move to play
+            self.__deadline = start + time_ms / 1000 if time_ms else None
+            self.__max_nodes = max_nodes
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        logger.info("Search finished: %s", result)
+        return result
+
+    def evaluate(self, color: Color) -> int:
+        score = 0
+        for pawns, sign in ((self.board.get_white_pawns(), 1), (self.board.get_black_pawns(), -1)):
+            for piece_type, position in pawns:
+                score += sign * (VALUES[piece_type] + CENTER_BONUS[position.x] + CENTER_BONUS[position.y])
+        return score if color == Color.WHITE else -score
+
+    # The score is not exact when every move failed low against the shared root bound, it
+    # is then only an upper bound that does not beat another search's move
+    def __search_root(self, color: Color, depth: int, previous_best: Optional[Move],
+                      root_moves: Optional[list[Move]] = None, root_bounds=None) -> tuple[Optional[Move], int, bool]:
+        # A score over a subset of the root moves is only a lower bound of the position
+        bound = EXACT if root_moves is None else LOWER_BOUND
+        if root_moves is None:
+            root_moves = list(self.move_generator.generate_legal_moves(color))
+        moves = self.__order_moves(root_moves, 0, previous_best)
+        best_move, alpha, exact = None, -INFINITY, False
+        for move in moves:
+            window = alpha if root_bounds is None else max(alpha, root_bounds.get(depth))
+            score = -self.__negamax(self.__opponent(color), depth - 1, -INFINITY, -window, 1, move)
+            if score > window:
+                best_move, alpha, exact = move, score, True
+                if root_bounds is not None:
+                    root_bounds.raise_to(depth, score)
+            elif best_move is None:
+                best_move, alpha = move, score
+        if best_move is None:
+            return None, -MATE_SCORE if self.board.is_in_check(color) else 0, True
+        if exact:
+            self.__store(depth, bound, alpha, 0, best_move)
+        return best_move, alpha, exact
+
+    def __negamax(self, color: Color, depth: int, alpha: int, beta: int, ply: int, move: Move) -> int:
+        current_pos, new_pos = move
+        pawn = self.board.get_piece(current_pos)
+        original_target = self.board.get_piece(new_pos)
+        self.board.make_move(pawn, new_pos, current_pos)
+        try:
+            return self.__search_position(color, depth, alpha, beta, ply)
+        finally:
+            self.board.undo_move(pawn, current_pos, new_pos, original_target)
+
+    def __search_position(self, color: Color, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % BUDGET_CHECK_INTERVAL == 0:
+            self.__check_budget()
+        if depth == 0:
+            return self.evaluate(color)
+        original_alpha, table_move = alpha, None
+        if self.transposition_table is not None:
+            entry = self.transposition_table.probe(self.board.position_key)
+            if entry is not None:
+                table_move = entry.move
+                if entry.depth >= depth:
+                    score = self.__score_from_table(entry.score, ply)
+                    if entry.bound == EXACT or (entry.bound == LOWER_BOUND and score >= beta) \
+                            or (entry.bound == UPPER_BOUND and score <= alpha):
+                        return score
+        moves = list(self.move_generator.generate_legal_moves(color))
+        if not moves:
+            return -MATE_SCORE + ply if self.board.is_in_check(color) else 0
+        best_move = None
+        for move in self.__order_moves(moves, ply, table_move):
+            score = -self.__negamax(self.__opponent(color), depth - 1, -beta, -alpha, ply + 1, move)
+            if score >= beta:
+                if not isinstance(self.board.get_piece(move[1]), Pawn):
+                    self.__store_killer(move, ply)
+                self.__store(depth, LOWER_BOUND, beta, ply, move)
+                return beta
+            if score > alpha:
+                alpha, best_move = score, move
+        self.__store(depth, EXACT if alpha > original_alpha else UPPER_BOUND, alpha, ply, best_move)
+        return alpha
+
+    def __store(self, depth: int, bound: int, score: int, ply: int, move: Optional[Move]) -> None:
+        if self.transposition_table is not None:
+            self.transposition_table.store(self.board.position_key, depth, bound,
+                                           self.__score_to_table(score, ply), move)
+
+    # Mate scores are stored relative to the node so they stay valid at any ply
+    def __score_to_table(self, score: int, ply: int) -> int:
+        if score >= MATE_SCORE - MAX_DEPTH:
+            return score + ply
+        if score <= -MATE_SCORE + MAX_DEPTH:
+            return score - ply
+        return score
+
+    def __score_from_table(self, score: int, ply: int) -> int:
+        if score >= MATE_SCORE - MAX_DEPTH:
+            return score - ply
+        if score <= -MATE_SCORE + MAX_DEPTH:
+            return score + ply
+        return score
+
+    def __check_budget(self) -> None:
+        if self.__deadline is not None and time.perf_counter() >= self.__deadline:
+            raise SearchTimeout()
+        if self.__max_nodes is not None and self.nodes >= self.__max_nodes:
+            raise SearchTimeout()
+
+    # Previous best move first, then captures by MVV-LVA, killer moves and the quiet moves
+    def __order_moves(self, moves: list[Move], ply: int, best_move: Optional[Move] = None) -> list[Move]:
+        killers = self.__killers[ply] if ply < len(self.__killers) else []
+
+        def priority(move: Move) -> int:
+            if move == best_move:
+                return 3 * INFINITY
+            target = self.board.get_piece(move[1])
+            if isinstance(target, Pawn):
+                attacker = self.board.get_piece(move[0])
+                return 2 * INFINITY + 10 * VALUES[type(target)] - VALUES[type(attacker)] // 10
+            if move in killers:
+                return INFINITY
+            return 0
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def __store_killer(self, move: Move, ply: int) -> None:
+        if ply >= len(self.__killers):
+            return
+        killers = self.__killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    def __opponent(self, color: Color) -> Color:
+        return Color.BLACK if color == Color.WHITE else Color.WHITE
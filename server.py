@@ -1,105 +1,324 @@
-import socket
-import threading
+import argparse
+import asyncio
+import secrets
+import time
+from typing import Any, Optional
 
-from chess_engine import ChessEngine
+from point import Point
+from pawns import Color
+from game_room import GameRoom
+from move_result import MoveStatus, MoveResult
+from engine_pool import EnginePool
+from instrumentation import LatencyStats
+from protocol import FrameDecoder, Message, MessageType, ProtocolError, encode_move_message, \
+    encode_control_message
 import utils
 
-  
+
 logger = utils.get_logger(__name__)
 
+# Room for bursts of simultaneous connects, the default of 100 makes clients retry SYNs
+LISTEN_BACKLOG = 1024
+READ_SIZE = 65536
+HINT_DEPTH = 2
+# Seconds a dropped player's seat is held for a resume
+RESUME_TIMEOUT = 30.0
+
+
+def color_name(color: Color) -> str:
+    return color.name.lower()
+
 
 class ChessServer:
-    def __init__(self) -> None:
-        self.server_ip = 'localhost'
-        self.server_port = 12345
-        self.board = None  # Placeholder for the chess board
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((self.server_ip, self.server_port))
-        self.server_socket.settimeout(1)
-        self.players = {}
-        self.game = ChessEngine()
-
-    def player_handler(self) -> None:
-        try:
-            client_socket, addr = self.server_socket.accept()
-            logger.info(f"Connection from {addr} has been established.")
-            if "player1" not in self.players:
-                self.players["player1"] = client_socket
-                logger.info("Player 1 connected.")
-                self.send_data(client_socket, "You are Player 1. Waiting for Player 2...")
-            elif "player2" not in self.players:
-                self.players["player2"] = client_socket
-                logger.info("Player 2 connected.")
-                self.send_data(client_socket, "You are Player 2. Game starting...")
-                self.send_data(self.players["player1"], "Player 2 has joined. Game starting...")
-        except Exception as e:
-            logger.info(f"An error occurred: {e}")
+    # One asyncio task per connection. Connecting clients are paired into rooms in
+    # arrival order and every room has its own ChessEngine. Messages use the framed
+    # binary protocol from protocol.py. With engine_workers the engine calls run in an
+    # EnginePool and the room engines only replay accepted moves.
+    # A connection starts with a join or a resume. Joining hands out a session token, and
+    # a dropped player's seat is held for resume_timeout seconds. Resuming with the token and
+    # the number of moves already received replays only the moves missed since then.
+    def __init__(self, server_ip: str = 'localhost', server_port: int = 12345, engine_workers: int = 0,
+                 max_pending: Optional[int] = None, resume_timeout: float = RESUME_TIMEOUT) -> None:
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.resume_timeout = resume_timeout
+        self.sessions: dict[str, tuple[GameRoom, Color]] = {}
+        self.engine_pool = EnginePool(engine_workers, max_pending) if engine_workers > 0 else None
+        self.latency = {"validate": LatencyStats(), "hint": LatencyStats()}
+        self.rooms: dict[int, GameRoom] = {}
+        self.waiting_room: Optional[GameRoom] = None
+        self.__next_room_id = 1
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self.__server = await asyncio.start_server(self.handle_client, self.server_ip, self.server_port,
+                                                   backlog=LISTEN_BACKLOG)
+        # Port 0 binds to any free port, report the real one
+        self.server_port = self.__server.sockets[0].getsockname()[1]
+        logger.info("Listening on %s:%d", self.server_ip, self.server_port)
+
+    async def serve_forever(self) -> None:
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def stop(self) -> None:
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        for room in list(self.rooms.values()):
+            for timer in room.held_seats.values():
+                timer.cancel()
+            room.held_seats.clear()
+            for writer in room.players.values():
+                writer.close()
+        # Handlers see the closed connections and finish before the loop can cancel them
+        await asyncio.gather(*self.__connections, return_exceptions=True)
+        if self.engine_pool is not None:
+            self.engine_pool.close()
 
     def run_server(self) -> None:
-        self.stop_event = threading.Event()
-        self.server_socket.listen(1)
-        logger.info("Waiting for a connection...")
+        asyncio.run(self.serve_forever())
+
+    def join(self, writer: asyncio.StreamWriter) -> tuple[GameRoom, Color]:
+        room = self.waiting_room
+        if room is None:
+            room = GameRoom(self.__next_room_id)
+            self.__next_room_id += 1
+            self.rooms[room.room_id] = room
+            self.waiting_room = room
+        color = room.add_player(writer)
+        token = secrets.token_urlsafe(16)
+        room.tokens[color] = token
+        self.sessions[token] = (room, color)
+        if room.is_full():
+            room.started = True
+            self.waiting_room = None
+        return room, color
+
+    # Takes over the seat of a session, a connection still holding it is closed
+    # Everything is checked before the seat changes hands, a bad request leaves the
+    # current connection in place
+    def resume(self, writer: asyncio.StreamWriter, token: str, ply: int) -> tuple[GameRoom, Color]:
+        session = self.sessions.get(token) if isinstance(token, str) else None
+        if session is None:
+            raise ProtocolError("unknown session")
+        room, color = session
+        if type(ply) is not int or not 0 <= ply <= len(room.moves):
+            raise ProtocolError(f"invalid ply {ply}")
+        timer = room.held_seats.pop(color, None)
+        if timer is not None:
+            timer.cancel()
+        previous = room.players.get(color)
+        if previous is not None:
+            previous.close()
+        room.add_player(writer, color)
+        return room, color
+
+    async def open_session(self, writer: asyncio.StreamWriter, message: Message) -> tuple[GameRoom, Color]:
+        hello = message.control["type"] if message.type == MessageType.CONTROL else None
+        if hello == "resume":
+            ply = message.control.get("ply", 0)
+            room, color = self.resume(writer, message.control.get("token"), ply)
+            logger.info("Session resumed in room %d as %s from ply %d", room.room_id, color_name(color), ply)
+            frames = [encode_control_message({"type": "resumed", "room": room.room_id, "color": color_name(color),
+                                              "ply": ply})]
+            frames += [encode_move_message(*move) for move in room.moves[ply:]]
+            if room.engine.winner is not None:
+                frames.append(encode_control_message({"type": "checkmate", "winner": color_name(room.engine.winner)}))
+            await self.send(writer, b"".join(frames))
+            await self.notify(room.opponent_of(color), encode_control_message({"type": "opponent_resumed"}))
+            return room, color
+        if hello != "join":
+            raise ProtocolError("expected a join or resume message")
+        room, color = self.join(writer)
+        logger.info("Connection from %s joined room %d as %s", writer.get_extra_info("peername"),
+                    room.room_id, color_name(color))
+        await self.send(writer, encode_control_message({"type": "joined", "room": room.room_id,
+                                                        "color": color_name(color), "token": room.tokens[color]}))
+        if room.is_full():
+            for player in room.players.values():
+                await self.send(player, encode_control_message({"type": "start"}))
+        return room, color
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.__connections.add(asyncio.current_task())
+        decoder = FrameDecoder()
+        room, color, left = None, None, False
         try:
-            while len(self.players) < 2:
-                try:
-                    self.player_handler()
-                except socket.timeout:
-                    if self.stop_event.is_set():
+            messages = []
+            while not messages:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    return
+                messages = decoder.feed(data)
+            room, color = await self.open_session(writer, messages.pop(0))
+            while not left:
+                for message in messages:
+                    if message.type == MessageType.CONTROL and message.control["type"] == "leave":
+                        left = True
                         break
-
-            player1thread = threading.Thread(target=self.handle_move, args=("player1",))
-            player2thread = threading.Thread(target=self.handle_move, args=("player2",))
-            player1thread.start()
-            player2thread.start()
-            player1thread.join(timeout=1)
-            player2thread.join(timeout=1)
-        except KeyboardInterrupt:
-            logger.info(f"KeyboardInterrupt: Stopping the server...")
+                    await self.handle_message(room, color, message)
+                else:
+                    data = await reader.read(READ_SIZE)
+                    if not data:
+                        break
+                    messages = decoder.feed(data)
+        except ProtocolError as e:
+            logger.warning("Dropping client: %s", e)
+            await self.send_error(writer, str(e))
+            left = True
+        except ConnectionError as e:
+            logger.info("Connection error: %s", e)
         finally:
-            self.stop_event.set()
+            if room is not None:
+                await self.leave(room, color, writer, hold_seat=not left)
+            writer.close()
+            self.__connections.discard(asyncio.current_task())
 
-    def recv_data(self, client_socket) -> str:
+    async def handle_message(self, room: GameRoom, color: Color, message: Message) -> None:
+        if message.type == MessageType.MOVE:
+            await self.handle_move(room, color, message.move)
+        elif message.control["type"] == "hint":
+            await self.handle_hint(room, color)
+        else:
+            await self.send_error(room.players[color], f"unknown control message {message.control['type']}")
+
+    # The room's engine is the authority: accepted moves go to both players, the mover's
+    # copy is the acknowledgement, and check or checkmate follows as a control message
+    async def handle_move(self, room: GameRoom, color: Color, move: tuple[Point, Point]) -> None:
+        writer = room.players[color]
+        if not room.started:
+            await self.send_illegal(writer, "game has not started")
+            return
+        if room.engine.winner is not None:
+            await self.send_illegal(writer, "game is over")
+            return
+        if room.engine.check_whose_turn() != color:
+            await self.send_illegal(writer, "not your turn")
+            return
+        result = await self.validate_move(room, color, move)
+        if not result.accepted:
+            await self.send_illegal(writer, result.reason)
+            return
+        room.moves.append(move)
+        frame = encode_move_message(*move)
+        if result.status == MoveStatus.CHECK:
+            frame += encode_control_message({"type": "check"})
+        elif result.status == MoveStatus.CHECKMATE:
+            frame += encode_control_message({"type": "checkmate", "winner": color_name(color)})
+        # The move is already recorded, so a mover who just dropped gets it in the resume
+        # replay. The opponent goes first and neither send may fail the other, an opponent
+        # who missed the move would wait forever.
+        await self.notify(room.opponent_of(color), frame)
+        await self.notify(writer, frame)
+
+    # A dropped player's seat is held while the game is on, a player who left or whose
+    # seat timed out is gone for good
+    async def leave(self, room: GameRoom, color: Color, writer: Optional[asyncio.StreamWriter] = None,
+                    hold_seat: bool = False) -> None:
+        if not room.remove_player(color, writer):
+            return
+        if hold_seat and room.started and room.engine.winner is None:
+            logger.info("Holding the %s seat of room %d for %.0fs", color_name(color), room.room_id,
+                        self.resume_timeout)
+            room.held_seats[color] = asyncio.get_running_loop().call_later(
+                self.resume_timeout, lambda: asyncio.ensure_future(self.release_seat(room, color)))
+            await self.notify(room.opponent_of(color), encode_control_message({"type": "opponent_disconnected"}))
+            return
+        await self.release_seat(room, color)
+
+    async def release_seat(self, room: GameRoom, color: Color) -> None:
+        room.held_seats.pop(color, None)
+        self.sessions.pop(room.tokens.pop(color, None), None)
+        if room.is_empty():
+            self.rooms.pop(room.room_id, None)
+            for token in room.tokens.values():
+                self.sessions.pop(token, None)
+            if self.waiting_room is room:
+                self.waiting_room = None
+            return
+        await self.notify(room.opponent_of(color), encode_control_message({"type": "opponent_left"}))
+
+    async def send(self, writer: asyncio.StreamWriter, frame: bytes) -> None:
+        writer.write(frame)
+        await writer.drain()
+
+    # For messages to other players, whose connection trouble is their own handler's business
+    async def notify(self, writer: Optional[asyncio.StreamWriter], frame: bytes) -> None:
+        if writer is None:
+            return
         try:
-            data = client_socket.recv(1024)
-            if not data:
-                return None
-            data = data.decode()
-            logger.info(f"Received move: {data}")
-            return data
-        except socket.timeout:
-            return None
-        except Exception as e:
-            return None
-    
-    def send_data(self, client_socket, data: str) -> None:
-        client_socket.sendall(data.encode())
-        logger.info(f"Sent move: {data}")
-
-    def handle_move(self, player_id: str) -> None:
-        client_socket = self.players[player_id]
-
-        while not self.stop_event.is_set():
-            try:
-                move = self.recv_data(client_socket)
-                if move is None:
-                    if self.stop_event.is_set():
-                        break
-                    continue
+            await self.send(writer, frame)
+        except ConnectionError:
+            pass
 
-                logger.info(f"{player_id} made a move: {move}")
-            except Exception as e:
-                logger.info(f"An error occurred with {player_id}: {e}")
-                break
+    async def validate_move(self, room: GameRoom, color: Color, move: tuple[Point, Point]) -> MoveResult:
+        start = time.perf_counter()
+        if self.engine_pool is None:
+            result = room.engine.apply_move(*move)
+        else:
+            result = await self.engine_pool.validate_move(room.engine.board, color, *move)
+            if result.accepted:
+                room.engine.apply_result(result)
+        self.latency["validate"].record(time.perf_counter() - start)
+        return result
 
-        client_socket.close()
-        del self.players[player_id]
-        logger.info(f"{player_id} thread terminated.")
+    async def handle_hint(self, room: GameRoom, color: Color) -> None:
+        if not room.started or room.engine.check_whose_turn() != color or room.engine.winner is not None:
+            await self.send_error(room.players[color], "hints are only given on your turn")
+            return
+        # Hints are optional, so they give way to move validation when the pool is full
+        if self.engine_pool is not None and self.engine_pool.is_saturated():
+            await self.send_error(room.players[color], "engine is busy, try again later")
+            return
+        start = time.perf_counter()
+        if self.engine_pool is None:
+            move = room.engine.best_move(depth=HINT_DEPTH).best_move
+        else:
+            move = await self.engine_pool.best_move(room.engine.board, color, depth=HINT_DEPTH)
+        self.latency["hint"].record(time.perf_counter() - start)
+        await self.send(room.players[color], encode_control_message(
+            {"type": "hint", "move": [move[0].index, move[1].index] if move else None}))
 
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {name: latency.as_dict() for name, latency in self.latency.items()}
+        if self.engine_pool is not None:
+            stats["engine_pool"] = {"workers": self.engine_pool.workers, "in_flight": self.engine_pool.in_flight,
+                                    "max_pending": self.engine_pool.max_pending,
+                                    "saturated": self.engine_pool.is_saturated()}
+        return stats
 
-if __name__ == "__main__":
-    server = ChessServer()
+    async def send_illegal(self, writer: asyncio.StreamWriter, reason: str) -> None:
+        logger.debug("Rejected move: %s", reason)
+        await self.send(writer, encode_control_message({"type": "illegal", "reason": reason}))
+
+    async def send_error(self, writer: asyncio.StreamWriter, error: str) -> None:
+        try:
+            await self.send(writer, encode_control_message({"type": "error", "message": error}))
+        except ConnectionError:
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host chess games")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--engine-workers", type=int, default=0,
+                        help="run engine calls in this many worker processes, 0 keeps them in the event loop")
+    parser.add_argument("--max-pending", type=int, help="engine requests in flight before clients have to wait")
+    utils.add_logging_arguments(parser)
+    args = parser.parse_args()
+    utils.configure_logging_from_args(args)
+    server = ChessServer(args.host, args.port, args.engine_workers, args.max_pending)
     try:
         server.run_server()
     except KeyboardInterrupt:
-        server.stop_event.set()
-        server.server_socket.close()
+        logger.info("KeyboardInterrupt: Stopping the server...")
+
+
+if __name__ == "__main__":
+    main()
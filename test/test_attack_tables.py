@@ -0,0 +1,34 @@
+import unittest
+from parameterized import parameterized
+from attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS, \
+    ROOK_LINES, BISHOP_LINES, is_target
+from pawns import *
+from point import Point
+
+
+class TestAttackTables(unittest.TestCase):
+    @parameterized.expand([
+        (KNIGHT_ATTACKS, Point(0, 0), 2), (KNIGHT_ATTACKS, Point(4, 4), 8),
+        (KING_ATTACKS, Point(0, 0), 3), (KING_ATTACKS, Point(4, 4), 8),
+        (WHITE_PAWN_ATTACKS, Point(0, 1), 1), (WHITE_PAWN_ATTACKS, Point(3, 7), 0),
+        (BLACK_PAWN_ATTACKS, Point(3, 6), 2), (BLACK_PAWN_ATTACKS, Point(3, 0), 0),
+        (ROOK_LINES, Point(0, 0), 14), (ROOK_LINES, Point(3, 4), 14),
+        (BISHOP_LINES, Point(0, 0), 7), (BISHOP_LINES, Point(3, 3), 13),
+    ])
+    def test_should_count_targets(self, table, position, count):
+        self.assertEqual(bin(table[position.index]).count("1"), count)
+
+    def test_off_board_squares_should_never_be_targets(self):
+        self.assertFalse(is_target(KING_ATTACKS, Point(0, 0).index, Point(-1, 0).index))
+        self.assertFalse(is_target(KING_ATTACKS, Point(8, 0).index, Point(7, 0).index))
+
+    @parameterized.expand([
+        (WhiteKnight, Point(1, 0), Point(2, 2), True), (WhiteKnight, Point(1, 0), Point(1, 2), False),
+        (WhiteKing, Point(4, 0), Point(5, 1), True), (WhiteKing, Point(4, 0), Point(4, 0), False),
+        (WhiteQueen, Point(3, 0), Point(7, 4), True), (WhiteQueen, Point(3, 0), Point(4, 2), False),
+        (BlackRook, Point(0, 7), Point(0, 0), True), (BlackRook, Point(0, 7), Point(1, 6), False),
+        (BlackBishop, Point(2, 7), Point(7, 2), True), (BlackBishop, Point(2, 7), Point(2, 5), False),
+        (WhitePawn, Point(7, 1), Point(6, 2), True), (BlackPawn, Point(0, 6), Point(1, 7), False),
+    ])
+    def test_pieces_should_use_tables(self, piece, current_pos, new_pos, expected):
+        self.assertEqual(piece().can_capture(current_pos, new_pos), expected)
@@ -0,0 +1,184 @@
+import unittest
+from parameterized import parameterized # type: ignore
+from board import Board, EMPTY_SQUARE
+from bitboard import square_bit
+from pawns import *
+from point import Point
+
+
+class TestBitboardBoard(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8, use_bitboards=True)
+        self.grid_board = Board(8, 8)
+
+    def assert_bitboards_match_grid(self) -> None:
+        for y in range(8):
+            for x in range(8):
+                piece = self.board.board[y][x]
+                bit = square_bit(Point(x, y))
+                if isinstance(piece, Pawn):
+                    self.assertTrue(self.board.bitboards.pieces[type(piece)] & bit)
+                    self.assertTrue(self.board.bitboards.occupancy[piece.color] & bit)
+                else:
+                    self.assertFalse(self.board.bitboards.occupied & bit)
+
+    def test_should_reject_bitboards_on_non_standard_board(self):
+        with self.assertRaises(ValueError):
+            Board(10, 10, use_bitboards=True)
+
+    def test_initial_bitboards_should_match_grid(self):
+        self.assertEqual(bin(self.board.bitboards.occupied).count("1"), 32)
+        self.assert_bitboards_match_grid()
+
+    def test_bitboards_should_follow_execute_move(self):
+        self.board.execute_move(self.board.get_piece(Point(4, 1)), Point(4, 1), Point(4, 3))
+        self.assert_bitboards_match_grid()
+        self.assertEqual(self.board.get_piece(Point(4, 1)), EMPTY_SQUARE)
+
+    def test_bitboards_should_be_restored_by_undo_move(self):
+        occupied = self.board.bitboards.occupied
+        knight = self.board.get_piece(Point(1, 0))
+        self.board.make_move(knight, Point(2, 2), Point(1, 0))
+        self.assert_bitboards_match_grid()
+        self.board.undo_move(knight, Point(1, 0), Point(2, 2), EMPTY_SQUARE)
+        self.assert_bitboards_match_grid()
+        self.assertEqual(self.board.bitboards.occupied, occupied)
+
+    path_cases = [
+        (Point(0, 0), Point(0, 5)),     # blocked by own pawn
+        (Point(0, 1), Point(0, 3)),     # open file
+        (Point(2, 0), Point(5, 3)),     # blocked diagonal
+        (Point(3, 1), Point(7, 5)),     # open diagonal
+        (Point(0, 2), Point(7, 2)),     # open rank
+    ]
+
+    @parameterized.expand(path_cases)
+    def test_is_path_clear_should_match_grid_board(self, current_pos: Point, new_pos: Point):
+        self.assertEqual(self.board.is_path_clear(current_pos, new_pos),
+                         self.grid_board.is_path_clear(current_pos, new_pos))
+
+    attack_cases = [
+        (Point(2, 2), Color.WHITE, True),      # pawn and knight
+        (Point(4, 3), Color.WHITE, False),
+        (Point(5, 5), Color.BLACK, True),
+        (Point(3, 4), Color.BLACK, False),
+    ]
+
+    @parameterized.expand(attack_cases)
+    def test_is_square_attacked_should_match_grid_board(self, position: Point, color: Color, expected: bool):
+        self.assertEqual(self.board.is_square_attacked(position, color), expected)
+        self.assertEqual(self.grid_board.is_square_attacked(position, color), expected)
+
+
+class TestKingPositions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8, debug=True)
+
+    def test_should_return_opponent_king_positions(self):
+        self.assertEqual(self.board.get_king_position(Color.WHITE), Point(4, 7))
+        self.assertEqual(self.board.get_king_position(Color.BLACK), Point(4, 0))
+
+    def test_should_track_king_through_execute_move(self):
+        self.board.execute_move(self.board.get_piece(Point(4, 1)), Point(4, 1), Point(4, 3))
+        self.board.execute_move(self.board.get_piece(Point(4, 0)), Point(4, 0), Point(4, 1))
+        self.assertEqual(self.board.get_king_position(Color.BLACK), Point(4, 1))
+
+    def test_should_restore_king_after_simulated_capture(self):
+        king = self.board.get_piece(Point(4, 7))
+        rook = self.board.get_piece(Point(0, 0))
+        self.board.make_move(rook, Point(4, 7), Point(0, 0))
+        self.assertIsNone(self.board.get_king_position(Color.WHITE))
+        self.board.undo_move(rook, Point(0, 0), Point(4, 7), king)
+        self.assertEqual(self.board.get_king_position(Color.WHITE), Point(4, 7))
+
+    def test_debug_mode_should_detect_stale_cache(self):
+        self.board.king_positions[Color.WHITE] = Point(0, 0)
+        with self.assertRaises(AssertionError):
+            self.board.get_king_position(Color.BLACK)
+
+
+class TestAttackMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8)
+        self.bitboard = Board(8, 8, use_bitboards=True)
+
+    def play(self, *moves) -> None:
+        for board in (self.board, self.bitboard):
+            for current_pos, new_pos in moves:
+                board.execute_move(board.get_piece(Point(*current_pos)), Point(*current_pos), Point(*new_pos))
+
+    def test_initial_attack_map_should_cover_third_rank(self):
+        attack_map = self.board.compute_attack_map(Color.WHITE)
+        for x in range(8):
+            self.assertTrue(attack_map & self.board.square_bit(Point(x, 2)))
+            self.assertFalse(attack_map & self.board.square_bit(Point(x, 3)))
+
+    def test_attack_maps_should_match_between_representations(self):
+        self.play(((4, 1), (4, 3)), ((3, 6), (3, 4)), ((5, 0), (1, 4)))
+        for color in Color:
+            self.assertEqual(self.board.compute_attack_map(color), self.bitboard.compute_attack_map(color))
+
+    def test_should_detect_check(self):
+        self.play(((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)), ((3, 7), (7, 3)))
+        for board in (self.board, self.bitboard):
+            self.assertTrue(board.is_in_check(Color.WHITE))
+            self.assertFalse(board.is_in_check(Color.BLACK))
+
+    def test_attack_map_should_see_through_opposing_king(self):
+        self.play(((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)), ((3, 7), (7, 3)))
+        self.play(((4, 0), (5, 1)))
+        behind_king = self.board.square_bit(Point(4, 0))
+        self.assertTrue(self.board.compute_attack_map(Color.BLACK) & behind_king)
+        self.assertTrue(self.bitboard.compute_attack_map(Color.BLACK) & behind_king)
+
+    def test_attack_map_should_survive_simulated_move(self):
+        attack_map = self.board.compute_attack_map(Color.WHITE)
+        knight = self.board.get_piece(Point(1, 0))
+        self.board.make_move(knight, Point(2, 2), Point(1, 0))
+        self.assertNotEqual(self.board.compute_attack_map(Color.WHITE), attack_map)
+        self.board.undo_move(knight, Point(1, 0), Point(2, 2), EMPTY_SQUARE)
+        self.assertEqual(self.board.compute_attack_map(Color.WHITE), attack_map)
+
+
+class TestPositionKey(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8)
+
+    def play(self, board: Board, *moves) -> None:
+        for current_pos, new_pos in moves:
+            board.execute_move(board.get_piece(Point(*current_pos)), Point(*current_pos), Point(*new_pos))
+
+    def test_initial_key_should_match_full_hash(self):
+        self.assertNotEqual(self.board.position_key, 0)
+        self.assertEqual(self.board.position_key, self.board.compute_position_key())
+        self.assertEqual(self.board.position_key, Board(8, 8, use_bitboards=True).position_key)
+
+    def test_key_should_follow_executed_moves(self):
+        initial_key = self.board.position_key
+        self.play(self.board, ((6, 0), (5, 2)))
+        self.assertNotEqual(self.board.position_key, initial_key)
+        self.assertEqual(self.board.position_key, self.board.compute_position_key())
+        self.play(self.board, ((6, 7), (5, 5)), ((5, 2), (6, 0)), ((5, 5), (6, 7)))
+        self.assertEqual(self.board.position_key, initial_key)
+
+    def test_transpositions_should_share_key(self):
+        other = Board(8, 8)
+        self.play(self.board, ((4, 1), (4, 3)), ((4, 6), (4, 4)), ((3, 1), (3, 3)))
+        self.play(other, ((3, 1), (3, 3)), ((4, 6), (4, 4)), ((4, 1), (4, 3)))
+        self.assertEqual(self.board.position_key, other.position_key)
+
+    def test_side_to_move_should_change_key(self):
+        other = Board(8, 8)
+        self.play(self.board, ((0, 1), (0, 3)), ((0, 0), (0, 2)))
+        self.play(other, ((0, 1), (0, 3)), ((0, 0), (0, 1)), ((0, 1), (0, 2)))
+        self.assertEqual(self.board.get_board(), other.get_board())
+        self.assertNotEqual(self.board.position_key, other.position_key)
+
+    def test_simulated_capture_should_restore_key(self):
+        self.play(self.board, ((4, 1), (4, 3)), ((3, 6), (3, 4)))
+        key = self.board.position_key
+        pawn, target = self.board.get_piece(Point(4, 3)), self.board.get_piece(Point(3, 4))
+        self.board.make_move(pawn, Point(3, 4), Point(4, 3))
+        self.assertEqual(self.board.position_key, self.board.compute_position_key())
+        self.board.undo_move(pawn, Point(4, 3), Point(3, 4), target)
+        self.assertEqual(self.board.position_key, key)
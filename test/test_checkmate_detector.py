@@ -0,0 +1,62 @@
+import unittest
+from chess_engine import ChessEngine
+from checkmate_detector import CheckmateDetector
+from board import Board
+from check_exception import CheckException
+from game_over_exception import GameOverException
+from pawns import *
+from point import Point
+
+
+FOOLS_MATE = [((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)), ((3, 7), (7, 3))]
+
+
+class TestCheckmateDetector(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8)
+        self.detector = CheckmateDetector(self.board)
+
+    def play(self, *moves) -> None:
+        for current_pos, new_pos in moves:
+            self.board.execute_move(self.board.get_piece(Point(*current_pos)), Point(*current_pos), Point(*new_pos))
+
+    def test_should_not_report_checkmate_without_check(self):
+        self.assertFalse(self.detector.is_checkmate(Color.WHITE))
+
+    def test_should_detect_fools_mate(self):
+        self.play(*FOOLS_MATE)
+        self.assertTrue(self.detector.is_checkmate(Color.WHITE))
+
+    def test_should_find_interposition(self):
+        self.play(((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)))
+        self.assertFalse(self.detector.is_checkmate(Color.BLACK))
+
+    def test_should_find_capture_of_the_checker(self):
+        self.play(((4, 1), (4, 3)), ((3, 6), (3, 4)), ((5, 0), (1, 4)), ((1, 6), (1, 5)))
+        self.play(((1, 4), (2, 5)))
+        self.board.execute_move(self.board.get_piece(Point(2, 5)), Point(2, 5), Point(3, 6))
+        self.assertTrue(self.board.is_in_check(Color.BLACK))
+        self.assertFalse(self.detector.is_checkmate(Color.BLACK))
+
+    def test_double_check_should_only_consider_king_moves(self):
+        self.play(((4, 1), (0, 3)), ((4, 6), (0, 4)), ((3, 0), (4, 1)), ((1, 0), (3, 5)))
+        self.assertTrue(self.board.get_pin_analysis(Color.BLACK).is_double_check())
+        self.assertTrue(self.board.get_piece(Point(2, 6)).can_capture(Point(2, 6), Point(3, 5)))
+        self.assertTrue(self.detector.is_checkmate(Color.BLACK))
+
+
+class TestEngineCheckmate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = ChessEngine()
+
+    def test_move_piece_should_raise_game_over_on_checkmate(self):
+        for current_pos, new_pos in FOOLS_MATE[:-1]:
+            self.engine.move_piece(Point(*current_pos), Point(*new_pos))
+        with self.assertRaises(GameOverException):
+            self.engine.move_piece(Point(3, 7), Point(7, 3))
+
+    def test_move_piece_should_raise_check_when_king_can_escape(self):
+        for current_pos, new_pos in [((4, 1), (4, 3)), ((5, 6), (5, 5))]:
+            self.engine.move_piece(Point(*current_pos), Point(*new_pos))
+        with self.assertRaises(CheckException):
+            self.engine.move_piece(Point(3, 0), Point(7, 4))
@@ -1,5 +1,8 @@
 import unittest
+from parameterized import parameterized
 from chess_engine import ChessEngine
+from move_result import MoveStatus
+from point import Point
 from pawns import *
 from unittest.mock import MagicMock
 from board import EMPTY_SQUARE
@@ -10,6 +13,7 @@ class TestChessGame(unittest.TestCase):
     def setUp(self):
         self.game = ChessEngine()
         self.game.board = MagicMock()
+        self.game.board.is_black_to_move.side_effect = lambda: len(self.game.board.movements_history) % 2 == 1
         self.game.move_handler = MagicMock()
         self.game.check_handler = MagicMock()
         self.game.capture_handler = MagicMock()
@@ -114,3 +118,46 @@ class TestChessGame(unittest.TestCase):
     def test_switch_turn_should_return_WHITE_when_the_current_turn_is_BLACK(self):
         self.game.check_whose_turn = MagicMock(return_value=Color.BLACK)
         self.assertEqual(self.game.__switch_turn(), Color.WHITE)
+
+
+class TestApplyMove(unittest.TestCase):
+    def setUp(self):
+        self.game = ChessEngine()
+
+    def play(self, moves):
+        return [self.game.apply_move(Point(*current_pos), Point(*new_pos)) for current_pos, new_pos in moves]
+
+    def test_legal_move_should_be_applied(self):
+        result, = self.play([((4, 1), (4, 3))])
+        self.assertEqual(result.status, MoveStatus.LEGAL)
+        self.assertEqual(result.move, (Point(4, 1), Point(4, 3)))
+        self.assertIsInstance(self.game.board.get_piece(Point(4, 3)), WhitePawn)
+        self.assertEqual(self.game.check_whose_turn(), Color.BLACK)
+
+    @parameterized.expand([
+        ("empty square", ((4, 3), (4, 4))),
+        ("opponent piece", ((4, 6), (4, 4))),
+        ("blocked path", ((0, 0), (0, 3))),
+        ("off the board", ((4, 1), (4, 9))),
+    ])
+    def test_illegal_move_should_leave_the_board_untouched(self, _, move):
+        position_key = self.game.board.position_key
+        result, = self.play([move])
+        self.assertEqual(result.status, MoveStatus.ILLEGAL)
+        self.assertFalse(result.accepted)
+        self.assertEqual(self.game.board.position_key, position_key)
+        self.assertEqual(self.game.board.movements_history, [])
+
+    def test_capture_with_check_should_report_check(self):
+        results = self.play([((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)), ((6, 6), (6, 5)),
+                             ((7, 4), (6, 5))])
+        self.assertEqual(results[2].status, MoveStatus.CHECK)
+        self.assertEqual(results[4].status, MoveStatus.CHECK)
+        self.assertEqual(len(self.game.board.get_black_pawns()), 15)
+
+    def test_checkmate_should_end_the_game(self):
+        results = self.play([((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)), ((3, 7), (7, 3)),
+                             ((0, 1), (0, 2))])
+        self.assertEqual(results[3].status, MoveStatus.CHECKMATE)
+        self.assertEqual(self.game.winner, Color.BLACK)
+        self.assertEqual(results[4].reason, "game is over")
@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+from chess_engine import ChessEngine
+from engine_pool import EnginePool
+from move_result import MoveStatus
+from pawns import Color
+from point import Point
+
+
+class TestEnginePool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.pool = EnginePool(workers=1, max_pending=2)
+        self.engine = ChessEngine()
+
+    async def asyncTearDown(self) -> None:
+        self.pool.close()
+
+    async def test_should_validate_moves_without_touching_the_board(self):
+        legal = await self.pool.validate_move(self.engine.board, Color.WHITE, Point(4, 1), Point(4, 3))
+        illegal = await self.pool.validate_move(self.engine.board, Color.WHITE, Point(4, 1), Point(4, 4))
+        self.assertEqual(legal.status, MoveStatus.LEGAL)
+        self.assertEqual(legal.move, (Point(4, 1), Point(4, 3)))
+        self.assertEqual(illegal.status, MoveStatus.ILLEGAL)
+        self.assertEqual(self.engine.board.movements_history, [])
+
+    async def test_should_detect_checkmate_for_the_side_given(self):
+        for current_pos, new_pos in [((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3))]:
+            self.engine.apply_move(Point(*current_pos), Point(*new_pos))
+        result = await self.pool.validate_move(self.engine.board, Color.BLACK, Point(3, 7), Point(7, 3))
+        self.assertEqual(result.status, MoveStatus.CHECKMATE)
+        self.engine.apply_result(result)
+        self.assertEqual(self.engine.winner, Color.BLACK)
+
+    async def test_should_find_a_legal_best_move(self):
+        move = await self.pool.best_move(self.engine.board, Color.WHITE, depth=1)
+        self.assertIn(move, list(self.engine.generate_legal_moves(Color.WHITE)))
+
+    async def test_should_limit_requests_in_flight(self):
+        peak = 0
+
+        async def validate():
+            nonlocal peak
+            task = asyncio.ensure_future(self.pool.validate_move(self.engine.board, Color.WHITE,
+                                                                 Point(6, 0), Point(5, 2)))
+            while not task.done():
+                peak = max(peak, self.pool.in_flight)
+                await asyncio.sleep(0)
+            return await task
+
+        results = await asyncio.gather(*(validate() for _ in range(6)))
+        self.assertTrue(all(result.accepted for result in results))
+        self.assertEqual(peak, 2)
+        self.assertEqual(self.pool.in_flight, 0)
@@ -0,0 +1,84 @@
+import unittest
+from chess_engine import ChessEngine
+from check_exception import CheckException
+from point import Point
+from instrumentation import LatencyStats
+
+
+class TestEngineStats(unittest.TestCase):
+    def test_should_not_count_when_disabled(self):
+        engine = ChessEngine()
+        engine.move_piece(Point(4, 1), Point(4, 3))
+        stats = engine.stats()
+        self.assertNotIn("make_moves", stats)
+        self.assertIsNone(engine.board.stats)
+        self.assertIn("position_cache", stats)
+
+    def test_should_count_simulations_and_time_phases(self):
+        engine = ChessEngine(collect_stats=True)
+        engine.move_piece(Point(4, 1), Point(4, 3))
+        engine.best_move(depth=2)
+        stats = engine.stats()
+        self.assertGreater(stats["make_moves"], 0)
+        self.assertEqual(stats["make_moves"], stats["undo_moves"])
+        self.assertGreater(stats["check_evaluations"], 0)
+        self.assertEqual(stats["phases"]["validation"]["calls"], 1)
+        self.assertEqual(stats["phases"]["check"]["calls"], 1)
+        self.assertEqual(stats["phases"]["capture"]["calls"], 0)
+        self.assertGreaterEqual(stats["phases"]["validation"]["seconds"], 0.0)
+        self.assertIn("transposition_table", stats)
+
+    def test_should_time_capture_and_check_phases(self):
+        engine = ChessEngine(collect_stats=True)
+        for current_pos, new_pos in (((4, 1), (4, 3)), ((3, 6), (3, 4))):
+            engine.move_piece(Point(*current_pos), Point(*new_pos))
+        engine.move_piece(Point(4, 3), Point(3, 4))
+        stats = engine.stats()
+        self.assertEqual(stats["phases"]["capture"]["calls"], 1)
+        self.assertGreater(stats["path_checks"], 0)
+
+    def test_check_phase_should_be_timed_when_check_is_raised(self):
+        engine = ChessEngine(collect_stats=True)
+        for current_pos, new_pos in (((4, 1), (4, 3)), ((5, 6), (5, 4))):
+            engine.move_piece(Point(*current_pos), Point(*new_pos))
+        with self.assertRaises(CheckException):
+            engine.move_piece(Point(3, 0), Point(7, 4))
+        self.assertEqual(engine.stats()["phases"]["check"]["calls"], 3)
+
+    def test_reset_should_clear_counters(self):
+        engine = ChessEngine(collect_stats=True)
+        engine.move_piece(Point(4, 1), Point(4, 3))
+        engine.reset_stats()
+        stats = engine.stats()
+        self.assertEqual(stats["check_evaluations"], 0)
+        self.assertEqual(stats["phases"]["validation"]["calls"], 0)
+        self.assertEqual(stats["position_cache"]["hits"] + stats["position_cache"]["misses"], 0)
+
+    def test_should_stop_counting_when_disabled_again(self):
+        engine = ChessEngine(collect_stats=True)
+        engine.set_stats_enabled(False)
+        engine.move_piece(Point(4, 1), Point(4, 3))
+        engine.set_stats_enabled(True)
+        self.assertEqual(engine.stats()["phases"]["validation"]["calls"], 0)
+
+
+class TestLatencyStats(unittest.TestCase):
+    def test_should_report_percentiles_in_milliseconds(self):
+        latency = LatencyStats()
+        for sample in range(1, 101):
+            latency.record(sample / 1000)
+        stats = latency.as_dict()
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["p50_ms"], 51)
+        self.assertAlmostEqual(stats["p99_ms"], 100)
+        self.assertAlmostEqual(stats["max_ms"], 100)
+        self.assertAlmostEqual(stats["mean_ms"], 50.5)
+
+    def test_should_keep_only_the_recent_window_for_percentiles(self):
+        latency = LatencyStats(window=10)
+        for sample in [1.0] * 10 + [0.001] * 10:
+            latency.record(sample)
+        self.assertAlmostEqual(latency.percentile(0.99), 0.001)
+        self.assertEqual(latency.max_seconds, 1.0)
+        latency.reset()
+        self.assertEqual(latency.as_dict()["count"], 0)
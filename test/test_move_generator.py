@@ -0,0 +1,47 @@
+import unittest
+from chess_engine import ChessEngine
+from pawns import *
+from point import Point
+
+
+class TestMoveGenerator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = ChessEngine()
+        self.board = self.engine.board
+
+    def play(self, *moves) -> None:
+        for current_pos, new_pos in moves:
+            self.board.execute_move(self.board.get_piece(Point(*current_pos)), Point(*current_pos), Point(*new_pos))
+
+    def test_should_generate_twenty_moves_from_starting_position(self):
+        self.assertEqual(len(list(self.engine.generate_legal_moves(Color.WHITE))), 20)
+        self.assertEqual(len(list(self.engine.generate_legal_moves(Color.BLACK))), 20)
+
+    def test_should_generate_knight_jumps(self):
+        self.assertEqual(set(self.engine.legal_moves_from(Point(1, 0))),
+                         {(Point(1, 0), Point(0, 2)), (Point(1, 0), Point(2, 2))})
+
+    def test_should_generate_pawn_pushes_and_captures(self):
+        self.play(((4, 1), (4, 3)), ((3, 6), (3, 4)))
+        self.assertEqual(set(self.engine.legal_moves_from(Point(4, 3))),
+                         {(Point(4, 3), Point(4, 4)), (Point(4, 3), Point(3, 4))})
+
+    def test_should_not_return_moves_for_empty_square(self):
+        self.assertEqual(list(self.engine.legal_moves_from(Point(4, 4))), [])
+
+    def test_pinned_piece_should_not_leave_the_pin_ray(self):
+        self.play(((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)))
+        self.play(((6, 6), (6, 5)))
+        moves = set(self.engine.legal_moves_from(Point(6, 5)))
+        self.assertEqual(moves, {(Point(6, 5), Point(7, 4))})
+
+    def test_should_only_generate_check_evasions(self):
+        self.play(((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)), ((3, 7), (7, 3)))
+        self.assertEqual(list(self.engine.generate_legal_moves(Color.WHITE)), [])
+
+    def test_simulated_moves_should_leave_board_unchanged(self):
+        pieces = list(self.board.get_white_pawns())
+        grid = [row.copy() for row in self.board.get_board()]
+        list(self.engine.generate_legal_moves(Color.WHITE))
+        self.assertEqual(list(self.board.get_white_pawns()), pieces)
+        self.assertEqual(self.board.get_board(), grid)
@@ -0,0 +1,66 @@
+import unittest
+from parameterized import parameterized
+from chess_engine import ChessEngine
+from move_generator import MoveGenerator
+from parallel_search import run_benchmark
+from perft import load_position
+from search import Search, INFINITY
+from pawns import *
+from point import Point
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = ChessEngine(tt_size_mb=1, search_workers=2)
+
+    def tearDown(self) -> None:
+        self.engine.close()
+
+    def test_should_find_mate_in_one(self):
+        for current_pos, new_pos in (((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3))):
+            self.engine.move_piece(Point(*current_pos), Point(*new_pos))
+        result = self.engine.best_move(depth=2)
+        self.assertEqual(result.best_move, (Point(3, 7), Point(7, 3)))
+
+    def test_should_agree_with_single_process_search(self):
+        serial = ChessEngine(tt_size_mb=1).best_move(depth=2)
+        key = self.engine.board.position_key
+        result = self.engine.best_move(depth=2)
+        self.assertEqual(result.score, serial.score)
+        self.assertEqual(self.engine.board.position_key, key)
+
+    def test_time_limited_search_should_report_a_depth_every_worker_completed(self):
+        result = self.engine.best_move(time_ms=200)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertIn(result.best_move, list(self.engine.generate_legal_moves(Color.WHITE)))
+
+
+class LocalRootBounds:
+    def __init__(self) -> None:
+        self.scores = {}
+
+    def get(self, depth):
+        return self.scores.get(depth, -INFINITY)
+
+    def raise_to(self, depth, score):
+        self.scores[depth] = max(score, self.get(depth))
+
+
+class TestSharedRootBounds(unittest.TestCase):
+    @parameterized.expand([("initial",), ("middlegame",), ("endgame",)])
+    def test_split_searches_should_agree_with_a_full_search(self, name):
+        board, color = load_position(name)
+        full = Search(board).search(color, depth=3)
+        moves = list(MoveGenerator(board).generate_legal_moves(color))
+        bounds = LocalRootBounds()
+        partial = [Search(board).search(color, depth=3, root_moves=moves[i::3], root_bounds=bounds) for i in range(3)]
+        best = max((result.iterations[-1] for result in partial), key=lambda iteration: (iteration[1], iteration[2]))
+        self.assertEqual(best[1], full.score)
+        self.assertTrue(best[2])
+        self.assertEqual(bounds.get(3), full.score)
+
+    def test_benchmark_should_report_speedup_per_worker_count(self):
+        results = run_benchmark(2, [1, 2], ["endgame"])
+        self.assertEqual([result["workers"] for result in results], [1, 2])
+        self.assertEqual(results[0]["speedup"], 1.0)
+        self.assertTrue(all(result["nodes"] > 0 for result in results))
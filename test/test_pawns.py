@@ -239,3 +239,31 @@ class TestKing(unittest.TestCase):
     @parameterized.expand(king_invalid_moves)
     def test_invalid_capture_for_king(self, king, current_pos: Point, new_pos: Point):
         self.assertFalse(king().can_capture(current_pos, new_pos))
+
+
+class TestPieceFlyweights(unittest.TestCase):
+    pieces = [
+        (WhitePawn, PAWN, Color.WHITE), (BlackPawn, PAWN, Color.BLACK),
+        (WhiteKnight, KNIGHT, Color.WHITE), (BlackKnight, KNIGHT, Color.BLACK),
+        (WhiteBishop, BISHOP, Color.WHITE), (BlackBishop, BISHOP, Color.BLACK),
+        (WhiteRook, ROOK, Color.WHITE), (BlackRook, ROOK, Color.BLACK),
+        (WhiteQueen, QUEEN, Color.WHITE), (BlackQueen, QUEEN, Color.BLACK),
+        (WhiteKing, KING, Color.WHITE), (BlackKing, KING, Color.BLACK),
+    ]
+
+    @parameterized.expand(pieces)
+    def test_piece_should_be_shared_instance(self, piece, kind, color):
+        self.assertIs(piece(), piece())
+        self.assertEqual(piece().kind, kind)
+        self.assertEqual(piece().color, color)
+
+    def test_piece_should_be_immutable(self):
+        with self.assertRaises(AttributeError):
+            WhiteRook().color = Color.BLACK
+        self.assertFalse(hasattr(WhiteRook(), "__dict__"))
+
+    def test_board_should_reuse_piece_instances(self):
+        from board import Board
+        board = Board(8, 8)
+        self.assertIs(board.get_piece(Point(0, 0)), board.get_piece(Point(7, 0)))
+        self.assertIs(board.get_piece(Point(0, 1)), WhitePawn())
@@ -0,0 +1,56 @@
+import unittest
+from parameterized import parameterized
+from chess_engine import ChessEngine
+from perft import perft, divide, load_position, parse_placement, run_benchmark, HandlerMoveGenerator, \
+    BENCHMARK_POSITIONS, main
+from pawns import *
+from point import Point
+
+
+class TestPerft(unittest.TestCase):
+    @parameterized.expand([
+        ("initial", 1), ("initial", 2), ("initial", 3),
+        ("endgame", 1), ("endgame", 2),
+        ("middlegame", 1), ("middlegame", 2),
+    ])
+    def test_should_match_reference_counts(self, name, depth):
+        board, color = load_position(name)
+        self.assertEqual(perft(board, depth, color), BENCHMARK_POSITIONS[name][2][depth])
+
+    def test_divide_should_sum_to_perft(self):
+        board, color = load_position("kiwipete")
+        counts = divide(board, 2, color)
+        self.assertEqual(sum(counts.values()), perft(board, 2, color))
+        self.assertIn((Point(4, 4), Point(5, 6)), counts)
+
+    def test_should_leave_board_unchanged(self):
+        board, color = load_position("middlegame")
+        key = board.position_key
+        perft(board, 2, color)
+        self.assertEqual(board.position_key, key)
+        self.assertEqual(board.compute_position_key(), key)
+
+    def test_should_parse_placement(self):
+        pieces = parse_placement("4k3/8/8/8/8/8/3P4/4K3")
+        self.assertEqual(pieces, [(BlackKing, Point(4, 7)), (WhitePawn, Point(3, 1)), (WhiteKing, Point(4, 0))])
+
+    @parameterized.expand([("initial",), ("endgame",), ("middlegame",), ("kiwipete",)])
+    def test_handlers_should_agree_with_move_generator(self, name):
+        engine = ChessEngine()
+        board, color = load_position(name)
+        engine.board.set_position(parse_placement(BENCHMARK_POSITIONS[name][0]), color == Color.BLACK)
+        self.assertEqual(perft(engine.board, 2, color, HandlerMoveGenerator(engine)), perft(board, 2, color))
+
+    def test_engine_should_count_from_current_position(self):
+        engine = ChessEngine()
+        engine.move_piece(Point(4, 1), Point(4, 3))
+        self.assertEqual(engine.perft(1), 20)
+        self.assertEqual(sum(engine.divide(2).values()), engine.perft(2))
+
+    def test_benchmark_should_report_throughput(self):
+        results = run_benchmark(1, ["initial", "endgame"])
+        self.assertEqual([result["nodes"] for result in results], [20, 14])
+        self.assertTrue(all(result["nodes_per_second"] > 0 for result in results))
+
+    def test_cli_bench_should_pass_reference_counts(self):
+        self.assertEqual(main(["2", "--bench"]), 0)
@@ -0,0 +1,48 @@
+import unittest
+from piece_index import PieceIndex
+from pawns import *
+from point import Point
+
+
+class TestPieceIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = PieceIndex(8, 8, [(WhiteRook, Point(0, 0)), (WhiteKing, Point(4, 0)),
+                                       (WhitePawn, Point(4, 1))])
+
+    def test_should_iterate_pieces_with_positions(self):
+        self.assertEqual(list(self.index), [(WhiteRook, Point(0, 0)), (WhiteKing, Point(4, 0)),
+                                            (WhitePawn, Point(4, 1))])
+        self.assertIn((WhiteKing, Point(4, 0)), self.index)
+        self.assertNotIn((WhiteQueen, Point(4, 0)), self.index)
+
+    def test_move_should_keep_piece_order(self):
+        self.index.move(Point(4, 0), Point(5, 0))
+        self.assertEqual(list(self.index), [(WhiteRook, Point(0, 0)), (WhiteKing, Point(5, 0)),
+                                            (WhitePawn, Point(4, 1))])
+        self.assertIsNone(self.index.get(Point(4, 0)))
+
+    def test_remove_and_restore_should_update_lookup(self):
+        pieces = list(self.index)
+        slot = self.index.remove(Point(0, 0))
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.get(Point(4, 1)), WhitePawn)
+        self.index.restore(WhiteRook, Point(0, 0), slot)
+        self.assertEqual(list(self.index), pieces)
+        self.assertEqual(self.index.get(Point(4, 1)), WhitePawn)
+
+    def test_should_reject_invalid_operations(self):
+        with self.assertRaises(ValueError):
+            self.index.move(Point(3, 3), Point(3, 4))
+        with self.assertRaises(ValueError):
+            self.index.move(Point(0, 0), Point(4, 1))
+        with self.assertRaises(ValueError):
+            self.index.remove(Point(3, 3))
+
+    def test_iteration_should_survive_simulated_moves(self):
+        visited = []
+        for piece_type, position in self.index:
+            visited.append(position)
+            if piece_type is WhiteRook:
+                self.index.move(Point(4, 1), Point(4, 2))
+                self.index.move(Point(4, 2), Point(4, 1))
+        self.assertEqual(visited, [Point(0, 0), Point(4, 0), Point(4, 1)])
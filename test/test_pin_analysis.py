@@ -0,0 +1,44 @@
+import unittest
+from board import Board
+from pawns import *
+from point import Point
+
+
+class TestPinAnalysis(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = Board(8, 8)
+
+    def play(self, *moves) -> None:
+        for current_pos, new_pos in moves:
+            self.board.execute_move(self.board.get_piece(Point(*current_pos)), Point(*current_pos), Point(*new_pos))
+
+    def test_starting_position_should_have_no_pins_or_checks(self):
+        analysis = self.board.get_pin_analysis(Color.WHITE)
+        self.assertFalse(analysis.is_check())
+        self.assertEqual(analysis.pins, {})
+        self.assertTrue(analysis.allows(Point(4, 1), Point(4, 3)))
+
+    def test_should_detect_pinned_piece(self):
+        self.play(((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)), ((6, 6), (6, 5)))
+        analysis = self.board.get_pin_analysis(Color.BLACK)
+        self.assertIn(Point(6, 5), analysis.pins)
+        self.assertFalse(analysis.allows(Point(6, 5), Point(6, 4)))
+        self.assertTrue(analysis.allows(Point(6, 5), Point(7, 4)))
+
+    def test_should_only_allow_blocking_or_capturing_the_checker(self):
+        self.play(((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)))
+        analysis = self.board.get_pin_analysis(Color.BLACK)
+        self.assertEqual(analysis.checkers, [Point(7, 4)])
+        self.assertTrue(analysis.allows(Point(6, 6), Point(6, 5)))
+        self.assertFalse(analysis.allows(Point(0, 6), Point(0, 5)))
+
+    def test_double_check_should_not_allow_non_king_moves(self):
+        self.play(((4, 1), (0, 3)), ((4, 6), (0, 4)), ((3, 0), (4, 1)), ((1, 0), (3, 5)))
+        analysis = self.board.get_pin_analysis(Color.BLACK)
+        self.assertTrue(analysis.is_double_check())
+        self.assertFalse(analysis.allows(Point(2, 6), Point(3, 5)))
+
+    def test_simulated_action_should_use_pin_analysis(self):
+        self.play(((4, 1), (4, 3)), ((5, 6), (5, 5)), ((3, 0), (7, 4)), ((6, 6), (6, 5)))
+        pawn = self.board.get_piece(Point(6, 5))
+        self.assertFalse(self.board.is_simulated_action_valid(pawn, Point(6, 5), Point(6, 4), None, Color.BLACK))
@@ -0,0 +1,34 @@
+import copy
+import pickle
+import unittest
+from parameterized import parameterized
+from point import Point
+
+
+class TestPoint(unittest.TestCase):
+    @parameterized.expand([(0, 0), (3, 4), (7, 7)])
+    def test_board_squares_should_be_interned(self, x, y):
+        point = Point(x, y)
+        self.assertIs(point, Point(x, y))
+        self.assertIs(point, Point.of(x, y))
+        self.assertIs(point, Point.from_index(y * 8 + x))
+        self.assertEqual(point.index, y * 8 + x)
+
+    @parameterized.expand([(-1, 0), (8, 3), (2, 10)])
+    def test_off_board_points_should_compare_by_value(self, x, y):
+        self.assertEqual(Point(x, y), Point.of(x, y))
+        self.assertEqual(hash(Point(x, y)), hash(Point(x, y)))
+        self.assertNotEqual(Point(x, y), Point(0, 0))
+
+    def test_should_be_immutable(self):
+        point = Point(1, 2)
+        with self.assertRaises(AttributeError):
+            point.x = 5
+        with self.assertRaises(AttributeError):
+            point.z = 5
+        self.assertEqual(point, Point(1, 2))
+
+    def test_copies_should_keep_identity(self):
+        point = Point(6, 1)
+        self.assertIs(pickle.loads(pickle.dumps(point)), point)
+        self.assertIs(copy.deepcopy(point), point)
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+from chess_engine import ChessEngine
+from position_cache import PositionCache
+from pawns import Color
+from point import Point
+
+
+class TestPositionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = PositionCache(2)
+
+    def test_should_count_hits_and_misses(self):
+        compute = MagicMock(return_value=None)
+        self.assertIsNone(self.cache.get_or_compute(1, "check", compute))
+        self.assertIsNone(self.cache.get_or_compute(1, "check", compute))
+        compute.assert_called_once()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_should_evict_least_recently_used_position(self):
+        self.cache.put(1, "check", True)
+        self.cache.put(2, "check", False)
+        self.cache.get_or_compute(1, "check", MagicMock())
+        self.cache.put(3, "check", False)
+        self.assertEqual(len(self.cache), 2)
+        compute = MagicMock(return_value=True)
+        self.cache.get_or_compute(2, "check", compute)
+        compute.assert_called_once()
+
+    def test_zero_size_should_disable_caching(self):
+        cache = PositionCache(0)
+        compute = MagicMock(return_value=True)
+        cache.get_or_compute(1, "check", compute)
+        cache.get_or_compute(1, "check", compute)
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_should_reset_entries_and_counters(self):
+        self.cache.get_or_compute(1, "check", MagicMock())
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats(), {"size": 0, "max_size": 2, "hits": 0, "misses": 0})
+
+
+class TestEnginePositionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = ChessEngine(cache_size=16)
+
+    def test_should_reuse_results_for_the_same_position(self):
+        self.engine.get_checked_king_color(Color.WHITE)
+        self.assertEqual(len(list(self.engine.generate_legal_moves(Color.WHITE))), 20)
+        self.assertEqual(len(list(self.engine.generate_legal_moves(Color.WHITE))), 20)
+        self.engine.get_checked_king_color(Color.WHITE)
+        self.assertEqual((self.engine.position_cache.hits, self.engine.position_cache.misses), (2, 2))
+
+    def test_should_miss_after_board_mutation(self):
+        self.engine.get_checked_king_color(Color.WHITE)
+        self.engine.move_piece(Point(4, 1), Point(4, 3))
+        self.assertEqual((self.engine.position_cache.hits, self.engine.position_cache.misses), (0, 2))
@@ -0,0 +1,127 @@
+import unittest
+from parameterized import parameterized
+from board import Board
+from chess_engine import ChessEngine
+from pawns import *
+from point import Point
+from position_codec import parse_fen, pack_position, unpack_position, run_benchmark, random_game_positions, \
+    PositionError, PACKED_SIZE, INITIAL_FEN
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - - 0 1"
+ENDGAME = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 0 1"
+
+
+def squares(board):
+    return [[str(pawn) for pawn in row] for row in board.get_board()]
+
+
+class TestFen(unittest.TestCase):
+    def test_initial_board_should_emit_initial_fen(self):
+        self.assertEqual(Board(8, 8).to_fen(), INITIAL_FEN)
+
+    @parameterized.expand([(INITIAL_FEN,), (KIWIPETE,), (ENDGAME,)])
+    def test_should_round_trip(self, fen):
+        board = Board(8, 8)
+        board.load_fen(fen)
+        self.assertEqual(board.to_fen(), fen)
+        self.assertEqual(board.compute_position_key(), board.position_key)
+
+    def test_loaded_position_should_match_built_board(self):
+        board = Board(8, 8)
+        board.load_fen(INITIAL_FEN)
+        self.assertEqual(squares(board), squares(Board(8, 8)))
+        self.assertEqual(board.position_key, Board(8, 8).position_key)
+        self.assertEqual(board.king_positions, {Color.WHITE: Point(4, 0), Color.BLACK: Point(4, 7)})
+
+    def test_should_track_side_to_move_and_move_number(self):
+        board = Board(8, 8)
+        board.load_fen(ENDGAME)
+        self.assertTrue(board.is_black_to_move())
+        board.execute_move(board.get_piece(Point(7, 3)), Point(7, 3), Point(6, 4))
+        self.assertEqual(board.to_fen(), "8/2p5/3p4/KP4kr/1R3p2/8/4P1P1/8 w - - 0 2")
+
+    def test_engine_should_move_the_side_given_by_the_fen(self):
+        engine = ChessEngine()
+        engine.load_fen(ENDGAME)
+        self.assertEqual(engine.check_whose_turn(), Color.BLACK)
+        self.assertTrue(engine.apply_move(Point(7, 3), Point(6, 4)).accepted)
+        self.assertEqual(engine.check_whose_turn(), Color.WHITE)
+
+    def test_should_round_trip_positions_from_random_games(self):
+        for packed in random_game_positions(200, seed=5):
+            board = Board(8, 8)
+            board.load_packed(packed)
+            loaded = Board(8, 8)
+            loaded.load_fen(board.to_fen())
+            self.assertEqual(squares(loaded), squares(board))
+            self.assertEqual(loaded.pack(), packed)
+
+    def test_engine_should_follow_positions_loaded_into_its_board(self):
+        board = Board(8, 8)
+        board.load_fen(ENDGAME)
+        engine = ChessEngine()
+        engine.board.load_packed(board.pack())
+        self.assertEqual(engine.check_whose_turn(), Color.BLACK)
+        engine.board.set_position(*parse_fen(INITIAL_FEN))
+        self.assertEqual(engine.check_whose_turn(), Color.WHITE)
+
+    @parameterized.expand([
+        ("",),
+        ("8/8/8/8/8/8/8 w - - 0 1",),
+        ("9/8/8/8/8/8/8/8 w - - 0 1",),
+        ("ppppppppp/8/8/8/8/8/8/8 w - - 0 1",),
+        ("7x/8/8/8/8/8/8/8 w - - 0 1",),
+        ("8/8/8/8/8/8/8/8 x - - 0 1",),
+        ("7/9/8/8/8/8/8/8 w - - 0 1",),
+        ("p7/pppppppp/ppppppp/8/8/8/8/8 w - - 0 1",),
+    ])
+    def test_should_reject_invalid_fen(self, fen):
+        with self.assertRaises(PositionError):
+            parse_fen(fen)
+
+
+class TestPackedPosition(unittest.TestCase):
+    def test_should_take_33_bytes(self):
+        self.assertEqual(len(Board(8, 8).pack()), PACKED_SIZE)
+        self.assertEqual(PACKED_SIZE, 33)
+
+    @parameterized.expand([(INITIAL_FEN,), (KIWIPETE,), (ENDGAME,)])
+    def test_should_round_trip(self, fen):
+        board = Board(8, 8)
+        board.load_fen(fen)
+        loaded = Board(8, 8)
+        loaded.load_packed(board.pack())
+        self.assertEqual(squares(loaded), squares(board))
+        self.assertEqual(loaded.position_key, board.position_key)
+        self.assertEqual(loaded.to_fen(), fen)
+
+    def test_should_keep_the_side_given(self):
+        board = Board(8, 8)
+        board.execute_move(board.get_piece(Point(4, 1)), Point(4, 1), Point(4, 3))
+        pieces, black_to_move = unpack_position(pack_position(board, Color.BLACK))
+        loaded = Board(8, 8, use_bitboards=True)
+        loaded.set_position(pieces, black_to_move)
+        self.assertTrue(black_to_move)
+        self.assertEqual(loaded.position_key, board.position_key)
+        self.assertEqual(loaded.compute_position_key(), loaded.position_key)
+        self.assertEqual(loaded.bitboards.occupied, sum(1 << position.index for _, position in pieces))
+
+    @parameterized.expand([(bytearray,), (memoryview,)])
+    def test_should_load_any_bytes_like_data(self, buffer_type):
+        board = Board(8, 8)
+        board.load_fen(KIWIPETE)
+        loaded = Board(8, 8)
+        loaded.load_packed(buffer_type(board.pack()))
+        self.assertEqual(loaded.to_fen(), KIWIPETE)
+        with self.assertRaises(PositionError):
+            unpack_position(buffer_type(board.pack()[:-1]))
+
+    @parameterized.expand([(bytes(32),), (b"\xd0" + bytes(32),)])
+    def test_should_reject_invalid_data(self, data):
+        with self.assertRaises(PositionError):
+            unpack_position(data)
+
+    def test_benchmark_should_report_every_conversion(self):
+        results = run_benchmark(100, positions=20)
+        self.assertEqual(set(results), {"fen_parse", "fen_emit", "pack", "unpack", "load_packed"})
+        self.assertTrue(all(rate > 0 for rate in results.values()))
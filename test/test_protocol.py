@@ -0,0 +1,49 @@
+import unittest
+from parameterized import parameterized
+from point import Point
+from protocol import FrameDecoder, Message, MessageType, ProtocolError, encode_move_message, \
+    encode_control_message, HEADER
+
+
+class TestProtocol(unittest.TestCase):
+    def setUp(self) -> None:
+        self.decoder = FrameDecoder()
+
+    def test_move_should_take_two_body_bytes(self):
+        frame = encode_move_message(Point(4, 1), Point(4, 3))
+        self.assertEqual(len(frame), HEADER.size + 2)
+        self.assertEqual(self.decoder.feed(frame), [Message(MessageType.MOVE, move=(Point(4, 1), Point(4, 3)))])
+
+    def test_should_decode_control_message(self):
+        frame = encode_control_message({"type": "joined", "room": 3, "color": "white"})
+        message, = self.decoder.feed(frame)
+        self.assertEqual(message.control, {"type": "joined", "room": 3, "color": "white"})
+
+    def test_should_split_coalesced_frames(self):
+        data = encode_move_message(Point(0, 1), Point(0, 2)) + encode_control_message({"type": "start"}) \
+            + encode_move_message(Point(7, 6), Point(7, 4))
+        messages = self.decoder.feed(data)
+        self.assertEqual([message.type for message in messages],
+                         [MessageType.MOVE, MessageType.CONTROL, MessageType.MOVE])
+        self.assertEqual(self.decoder.pending(), 0)
+
+    def test_should_wait_for_partial_frames(self):
+        data = encode_control_message({"type": "start"}) + encode_move_message(Point(6, 0), Point(5, 2))
+        messages = []
+        for byte in range(len(data)):
+            messages += self.decoder.feed(data[byte:byte + 1])
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[1].move, (Point(6, 0), Point(5, 2)))
+
+    @parameterized.expand([
+        (HEADER.pack(3, MessageType.MOVE) + bytes((64, 0)),),
+        (HEADER.pack(2, MessageType.MOVE) + bytes((1,)),),
+        (HEADER.pack(3, 9) + bytes((1, 2)),),
+        (HEADER.pack(5, MessageType.CONTROL) + b"[1,2",),
+        (HEADER.pack(3, MessageType.CONTROL) + b"{}",),
+        (HEADER.pack(0, MessageType.MOVE),),
+        (HEADER.pack(60000, MessageType.CONTROL),),
+    ])
+    def test_should_reject_malformed_frames(self, data):
+        with self.assertRaises(ProtocolError):
+            self.decoder.feed(data)
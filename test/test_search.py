@@ -0,0 +1,44 @@
+import unittest
+from chess_engine import ChessEngine
+from pawns import *
+from point import Point
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = ChessEngine()
+
+    def play(self, *moves) -> None:
+        for current_pos, new_pos in moves:
+            self.engine.move_piece(Point(*current_pos), Point(*new_pos))
+
+    def test_should_find_mate_in_one(self):
+        self.play(((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)))
+        result = self.engine.best_move(depth=2)
+        self.assertEqual(result.best_move, (Point(3, 7), Point(7, 3)))
+        self.assertGreater(result.score, 0)
+
+    def test_should_capture_hanging_queen(self):
+        self.play(((4, 1), (4, 3)), ((3, 6), (3, 4)), ((3, 0), (6, 3)), ((2, 7), (6, 3)))
+        self.play(((0, 1), (0, 2)), ((6, 3), (3, 0)))
+        result = self.engine.best_move(depth=2)
+        self.assertEqual(result.best_move, (Point(4, 0), Point(3, 0)))
+
+    def test_search_should_leave_board_unchanged(self):
+        key = self.engine.board.position_key
+        grid = [row.copy() for row in self.engine.get_board()]
+        self.engine.best_move(depth=3)
+        self.assertEqual(self.engine.board.position_key, key)
+        self.assertEqual(self.engine.get_board(), grid)
+
+    def test_should_stop_at_node_budget(self):
+        result = self.engine.best_move(max_nodes=2000)
+        self.assertIsNotNone(result.best_move)
+        self.assertLess(result.nodes, 2000 + 1024)
+        self.assertGreater(result.nodes_per_second, 0)
+
+    def test_should_report_no_move_when_checkmated(self):
+        self.play(((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3)))
+        self.engine.board.execute_move(self.engine.board.get_piece(Point(3, 7)), Point(3, 7), Point(7, 3))
+        result = self.engine.best_move(depth=2)
+        self.assertIsNone(result.best_move)
@@ -0,0 +1,245 @@
+import asyncio
+import unittest
+import random
+from client import ChessClient, SessionLost, backoff_delay, BACKOFF_MAX
+from load_test import run_load_test
+from point import Point
+from pawns import Color
+from protocol import MessageType, FrameDecoder, encode_control_message
+from server import ChessServer
+
+
+class TestChessServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = ChessServer("localhost", 0)
+        await self.server.start()
+        self.clients = []
+
+    async def asyncTearDown(self) -> None:
+        for client in self.clients:
+            await client.close()
+        await self.server.stop()
+
+    async def connect(self) -> ChessClient:
+        client = ChessClient("localhost", self.server.server_port)
+        await client.connect()
+        self.clients.append(client)
+        return client
+
+    async def test_should_pair_clients_into_rooms(self):
+        white, black, third = await self.connect(), await self.connect(), await self.connect()
+        self.assertEqual((white.room_id, white.color), (1, "white"))
+        self.assertEqual((black.room_id, black.color), (1, "black"))
+        self.assertEqual((third.room_id, third.color), (2, "white"))
+        self.assertEqual((await white.recv_message()).control, {"type": "start"})
+        self.assertEqual((await black.recv_message()).control, {"type": "start"})
+        self.assertIs(self.server.waiting_room, self.server.rooms[2])
+        self.assertIsNot(self.server.rooms[1].engine, self.server.rooms[2].engine)
+
+    async def start_game(self) -> tuple[ChessClient, ChessClient]:
+        white, black = await self.connect(), await self.connect()
+        await white.recv_message()
+        await black.recv_message()
+        return white, black
+
+    async def play(self, white: ChessClient, black: ChessClient, moves: list[tuple[Point, Point]]) -> None:
+        for ply, (current_pos, new_pos) in enumerate(moves):
+            await (white if ply % 2 == 0 else black).send_move(current_pos, new_pos)
+            await white.recv_message()
+            await black.recv_message()
+
+    async def test_should_broadcast_accepted_moves_to_both_players(self):
+        white, black = await self.start_game()
+        await white.send_move(Point(4, 1), Point(4, 3))
+        for client in (white, black):
+            message = await client.recv_message()
+            self.assertEqual((message.type, message.move), (MessageType.MOVE, (Point(4, 1), Point(4, 3))))
+        self.assertEqual(self.server.rooms[1].moves, [(Point(4, 1), Point(4, 3))])
+        self.assertEqual(self.server.rooms[1].engine.board.movements_history, [(Point(4, 1), Point(4, 3))])
+
+    async def test_should_reject_illegal_moves_without_applying_them(self):
+        white, black = await self.start_game()
+        await white.send_move(Point(4, 1), Point(4, 4))
+        message = await white.recv_message()
+        self.assertEqual(message.control["type"], "illegal")
+        await black.send_move(Point(4, 6), Point(4, 4))
+        self.assertEqual((await black.recv_message()).control, {"type": "illegal", "reason": "not your turn"})
+        self.assertEqual(self.server.rooms[1].moves, [])
+
+    async def test_should_reject_moves_before_the_game_starts(self):
+        white = await self.connect()
+        await white.send_move(Point(4, 1), Point(4, 3))
+        self.assertEqual((await white.recv_message()).control, {"type": "illegal", "reason": "game has not started"})
+
+    async def test_should_announce_checkmate_to_both_players(self):
+        white, black = await self.start_game()
+        await self.play(white, black, [(Point(5, 1), Point(5, 2)), (Point(4, 6), Point(4, 4)),
+                                       (Point(6, 1), Point(6, 3))])
+        await black.send_move(Point(3, 7), Point(7, 3))
+        for client in (white, black):
+            self.assertEqual((await client.recv_message()).move, (Point(3, 7), Point(7, 3)))
+            self.assertEqual((await client.recv_message()).control, {"type": "checkmate", "winner": "black"})
+        await white.send_move(Point(0, 1), Point(0, 2))
+        self.assertEqual((await white.recv_message()).control, {"type": "illegal", "reason": "game is over"})
+
+    async def test_should_notify_opponent_and_drop_empty_rooms(self):
+        white, black = await self.connect(), await self.connect()
+        await black.recv_message()
+        await white.close()
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_left"})
+        await black.close()
+        for _ in range(100):
+            if not self.server.rooms:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.server.rooms, {})
+        self.assertIsNone(self.server.waiting_room)
+
+    async def test_should_reject_unknown_control_messages(self):
+        white = await self.connect()
+        await white.send_control({"type": "resign"})
+        self.assertEqual((await white.recv_message()).control,
+                         {"type": "error", "message": "unknown control message resign"})
+
+    async def test_should_give_hints_to_the_side_to_move(self):
+        white, black = await self.start_game()
+        await black.send_control({"type": "hint"})
+        self.assertEqual((await black.recv_message()).control["type"], "error")
+        await white.send_control({"type": "hint"})
+        current_index, new_index = (await white.recv_message()).control["move"]
+        result = self.server.rooms[1].engine.apply_move(Point.from_index(current_index), Point.from_index(new_index))
+        self.assertTrue(result.accepted)
+        self.assertEqual(self.server.stats()["hint"]["count"], 1)
+
+    async def test_should_hand_out_session_tokens(self):
+        white, black = await self.start_game()
+        self.assertNotEqual(white.token, black.token)
+        self.assertEqual(self.server.sessions[white.token], (self.server.rooms[1], Color.WHITE))
+
+    async def test_should_replay_missed_moves_after_a_dropped_connection(self):
+        white, black = await self.start_game()
+        await self.play(white, black, [(Point(4, 1), Point(4, 3))])
+        self.server.rooms[1].players[Color.WHITE].close()
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_disconnected"})
+        await black.send_move(Point(4, 6), Point(4, 4))
+        self.assertEqual((await black.recv_message()).move, (Point(4, 6), Point(4, 4)))
+        self.assertEqual((await white.recv_message()).move, (Point(4, 6), Point(4, 4)))
+        self.assertEqual((white.reconnects, white.ply), (1, 2))
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_resumed"})
+        await white.send_move(Point(6, 0), Point(5, 2))
+        self.assertEqual((await black.recv_message()).move, (Point(6, 0), Point(5, 2)))
+
+    async def test_should_deliver_the_move_to_the_opponent_when_the_mover_drops(self):
+        white, black = await self.start_game()
+        mover = self.server.rooms[1].players[Color.WHITE]
+        send = self.server.send
+
+        async def send_to_dropped_mover(writer, frame):
+            if writer is mover:
+                raise ConnectionResetError()
+            await send(writer, frame)
+
+        self.server.send = send_to_dropped_mover
+        await white.send_move(Point(4, 1), Point(4, 3))
+        self.assertEqual((await black.recv_message()).move, (Point(4, 1), Point(4, 3)))
+        self.assertEqual(self.server.rooms[1].moves, [(Point(4, 1), Point(4, 3))])
+
+    async def test_should_release_the_seat_when_the_resume_times_out(self):
+        self.server.resume_timeout = 0.05
+        white, black = await self.start_game()
+        token = white.token
+        white.reconnect_attempts = 0
+        self.server.rooms[1].players[Color.WHITE].close()
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_disconnected"})
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_left"})
+        self.assertNotIn(token, self.server.sessions)
+
+    async def test_should_not_hold_the_seat_of_a_player_who_left(self):
+        white, black = await self.start_game()
+        token = white.token
+        await white.close()
+        self.assertEqual((await black.recv_message()).control, {"type": "opponent_left"})
+        self.assertNotIn(token, self.server.sessions)
+
+    async def test_should_reject_unknown_sessions(self):
+        client = ChessClient("localhost", self.server.server_port, reconnect_attempts=1)
+        self.clients.append(client)
+        client.token = "forged"
+        with self.assertRaises(SessionLost):
+            await client.reconnect()
+
+    async def send_raw_resume(self, token, ply) -> dict:
+        reader, writer = await asyncio.open_connection("localhost", self.server.server_port)
+        try:
+            writer.write(encode_control_message({"type": "resume", "token": token, "ply": ply}))
+            await writer.drain()
+            return FrameDecoder().feed(await reader.read(1024))[0].control
+        finally:
+            writer.close()
+
+    async def test_should_keep_the_seat_when_a_resume_asks_for_an_invalid_ply(self):
+        white, black = await self.start_game()
+        seat = self.server.rooms[1].players[Color.WHITE]
+        self.assertEqual(await self.send_raw_resume(white.token, 99), {"type": "error", "message": "invalid ply 99"})
+        self.assertIs(self.server.rooms[1].players[Color.WHITE], seat)
+        self.assertFalse(seat.is_closing())
+        await self.play(white, black, [(Point(4, 1), Point(4, 3))])
+        self.assertEqual(white.reconnects, 0)
+
+    async def test_should_reject_tokens_that_are_not_strings(self):
+        self.assertEqual(await self.send_raw_resume(["x"], 0), {"type": "error", "message": "unknown session"})
+
+    def test_backoff_should_grow_exponentially_up_to_the_cap(self):
+        class Highest(random.Random):
+            def uniform(self, low, high):
+                return high
+
+        delays = [backoff_delay(attempt, Highest()) for attempt in range(10)]
+        self.assertEqual(delays[:3], [0.1, 0.2, 0.4])
+        self.assertEqual(delays[-1], BACKOFF_MAX)
+
+
+class TestChessServerWithEnginePool(TestChessServer):
+    async def asyncSetUp(self) -> None:
+        self.server = ChessServer("localhost", 0, engine_workers=1)
+        await self.server.start()
+        self.clients = []
+
+    async def test_should_refuse_hints_while_the_engine_pool_is_saturated(self):
+        white, black = await self.start_game()
+        self.server.engine_pool.in_flight = self.server.engine_pool.max_pending
+        self.assertTrue(self.server.stats()["engine_pool"]["saturated"])
+        await white.send_control({"type": "hint"})
+        self.assertEqual((await white.recv_message()).control,
+                         {"type": "error", "message": "engine is busy, try again later"})
+        self.server.engine_pool.in_flight = 0
+
+
+class TestLoadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_should_play_random_legal_games(self):
+        report = await run_load_test(clients=6, moves=3, seed=7)
+        self.assertEqual(report["moves"], 18)
+        self.assertEqual(report["connect"]["count"], 6)
+        self.assertEqual(report["round_trip"]["count"], 18)
+        self.assertEqual(report["server"]["validate"]["count"], 18)
+        self.assertGreater(report["round_trip"]["p99_ms"], 0)
+        self.assertGreater(report["moves_per_second"], 0)
+
+    async def test_should_pace_moves_at_the_given_rate(self):
+        report = await run_load_test(clients=2, moves=3, rate=50, seed=7)
+        self.assertEqual(report["moves"], 6)
+        self.assertGreaterEqual(report["seconds"], 6 / 50)
+
+    async def test_should_reject_an_odd_number_of_clients(self):
+        with self.assertRaises(ValueError):
+            await run_load_test(clients=3, moves=2)
+
+    async def test_should_run_against_a_running_server(self):
+        server = ChessServer("localhost", 0)
+        await server.start()
+        try:
+            report = await run_load_test(clients=2, moves=2, port=server.server_port, seed=7)
+        finally:
+            await server.stop()
+        self.assertEqual(report["moves"], 4)
+        self.assertNotIn("server", report)
@@ -0,0 +1,91 @@
+import unittest
+from parameterized import parameterized
+from chess_engine import ChessEngine
+from point import Point
+from transposition_table import TranspositionTable, encode_move, decode_move, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = TranspositionTable(size_mb=0.01)
+
+    @parameterized.expand([
+        ((Point(0, 0), Point(0, 1)),),
+        ((Point(7, 7), Point(0, 0)),),
+        ((Point(1, 0), Point(2, 2)),),
+        (None,),
+    ])
+    def test_move_encoding_should_round_trip(self, move):
+        self.assertEqual(decode_move(encode_move(move)), move)
+
+    def test_should_return_stored_entry(self):
+        self.table.store(12345, 3, LOWER_BOUND, -42, (Point(4, 1), Point(4, 3)))
+        entry = self.table.probe(12345)
+        self.assertEqual((entry.depth, entry.bound, entry.score), (3, LOWER_BOUND, -42))
+        self.assertEqual(entry.move, (Point(4, 1), Point(4, 3)))
+
+    def test_should_miss_for_different_key_in_same_slot(self):
+        self.table.store(5, 1, EXACT, 0, None)
+        self.assertIsNone(self.table.probe(5 + self.table.size))
+        self.assertIsNone(self.table.probe(6))
+
+    def test_should_keep_deeper_entry_of_current_search(self):
+        self.table.store(5, 4, EXACT, 10, None)
+        self.table.store(5 + self.table.size, 2, EXACT, 20, None)
+        self.assertEqual(self.table.probe(5).score, 10)
+
+    def test_should_replace_entry_of_previous_search(self):
+        self.table.store(5, 4, EXACT, 10, None)
+        self.table.new_search()
+        self.table.store(5 + self.table.size, 2, UPPER_BOUND, 20, None)
+        self.assertIsNone(self.table.probe(5))
+        self.assertEqual(self.table.probe(5 + self.table.size).score, 20)
+        self.assertEqual(self.table.overwrites, 1)
+
+    def test_should_replace_same_position(self):
+        self.table.store(5, 4, EXACT, 10, None)
+        self.table.store(5, 1, EXACT, 20, None)
+        self.assertEqual(self.table.probe(5).score, 20)
+
+    def test_clear_should_drop_entries_and_stats(self):
+        self.table.store(5, 4, EXACT, 10, None)
+        self.table.probe(5)
+        self.table.clear()
+        self.assertEqual(self.table.get_stats()["hits"], 0)
+        self.assertIsNone(self.table.probe(5))
+
+    def test_should_report_hit_rate(self):
+        self.table.store(5, 1, EXACT, 0, None)
+        self.table.probe(5)
+        self.table.probe(6)
+        self.assertEqual(self.table.hit_rate, 0.5)
+
+    def test_should_size_table_from_memory_budget(self):
+        self.assertGreater(TranspositionTable(size_mb=1).size, TranspositionTable(size_mb=0.5).size)
+        with self.assertRaises(ValueError):
+            TranspositionTable(size_mb=0)
+
+
+class TestEngineTranspositionTable(unittest.TestCase):
+    def test_search_should_use_table(self):
+        engine = ChessEngine(tt_size_mb=1)
+        self.assertIsNone(engine.transposition_table)
+        first = engine.best_move(depth=3)
+        second = engine.best_move(depth=3)
+        self.assertGreater(engine.transposition_table.hits, 0)
+        self.assertLess(second.nodes, first.nodes)
+        self.assertEqual(second.best_move, first.best_move)
+
+    def test_should_find_mate_in_one_with_table(self):
+        engine = ChessEngine(tt_size_mb=1)
+        for current_pos, new_pos in (((5, 1), (5, 2)), ((4, 6), (4, 4)), ((6, 1), (6, 3))):
+            engine.move_piece(Point(*current_pos), Point(*new_pos))
+        engine.best_move(depth=2)
+        result = engine.best_move(depth=3)
+        self.assertEqual(result.best_move, (Point(3, 7), Point(7, 3)))
+
+    def test_should_clear_table_between_games(self):
+        engine = ChessEngine(tt_size_mb=1)
+        engine.best_move(depth=2)
+        engine.clear_transposition_table()
+        self.assertEqual(engine.transposition_table.get_stats()["stores"], 0)
@@ -0,0 +1,43 @@
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import utils
+
+
+class TestLoggingConfiguration(unittest.TestCase):
+    def tearDown(self) -> None:
+        utils.configure_logging("WARNING", trace=False)
+
+    def test_get_logger_should_not_install_handlers(self):
+        logger = utils.get_logger("test_utils.module")
+        self.assertEqual(logger.handlers, [])
+
+    @patch.dict(os.environ, {utils.LOG_LEVEL_ENV: "debug", utils.TRACE_ENV: "1"})
+    def test_should_read_level_and_trace_from_environment(self):
+        utils.configure_logging()
+        self.assertEqual(logging.getLogger().level, logging.DEBUG)
+        self.assertTrue(utils.TRACE)
+
+    def test_arguments_should_override_environment(self):
+        with patch.dict(os.environ, {utils.LOG_LEVEL_ENV: "debug", utils.TRACE_ENV: "1"}):
+            utils.configure_logging("error", trace=False)
+        self.assertEqual(logging.getLogger().level, logging.ERROR)
+        self.assertFalse(utils.TRACE)
+
+    def test_reconfiguring_should_not_duplicate_handlers(self):
+        root = logging.getLogger()
+        utils.configure_logging("INFO")
+        handlers = len(root.handlers)
+        utils.configure_logging("INFO")
+        self.assertEqual(len(root.handlers), handlers)
+
+    def test_file_sink_should_write_records(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chess.log")
+            utils.configure_logging("INFO", log_file=path)
+            utils.get_logger("test_utils.sink").info("written through the queue")
+            utils.configure_logging("WARNING")
+            with open(path) as log_file:
+                self.assertIn("written through the queue", log_file.read())
@@ -0,0 +1,112 @@
+from array import array
+from typing import Optional
+
+from point import Point
+
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+NO_MOVE = 0
+# Bytes per entry: key (8), score (4), move (2), depth (1), bound (1), generation (1), used flag (1)
+ENTRY_SIZE = 18
+BOARD_SIZE = 8
+
+Move = tuple[Point, Point]
+
+
+def encode_move(move: Optional[Move]) -> int:
+    if move is None:
+        return NO_MOVE
+    current_pos, new_pos = move
+    return ((current_pos.y * BOARD_SIZE + current_pos.x) << 6 | (new_pos.y * BOARD_SIZE + new_pos.x)) + 1
+
+
+def decode_move(code: int) -> Optional[Move]:
+    if code == NO_MOVE:
+        return None
+    code -= 1
+    current_square, new_square = code >> 6, code & 63
+    return Point.from_index(current_square), Point.from_index(new_square)
+
+
+class TTEntry:
+    def __init__(self, depth: int, bound: int, score: int, move: Optional[Move]) -> None:
+        self.depth = depth
+        self.bound = bound
+        self.score = score
+        self.move = move
+
+
+class TranspositionTable:
+    # One entry per slot in parallel typed arrays, a slot is picked by key modulo size.
+    # A stored entry is replaced by a deeper search, by the same position or once it
+    # comes from an older search generation.
+    def __init__(self, size_mb: float = 16) -> None:
+        if size_mb <= 0:
+            raise ValueError("Transposition table size must be positive")
+        self.size_mb = size_mb
+        self.size = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE)
+        self.__keys = array("Q", bytes(8 * self.size))
+        self.__scores = array("i", bytes(4 * self.size))
+        self.__moves = array("H", bytes(2 * self.size))
+        self.__depths = array("b", bytes(self.size))
+        self.__bounds = array("B", bytes(self.size))
+        self.__generations = array("B", bytes(self.size))
+        self.__used = array("B", bytes(self.size))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self) -> None:
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        slot = key % self.size
+        if not self.__used[slot] or self.__keys[slot] != key:
+            return None
+        self.hits += 1
+        return TTEntry(self.__depths[slot], self.__bounds[slot], self.__scores[slot],
+                       decode_move(self.__moves[slot]))
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: Optional[Move]) -> None:
+        slot = key % self.size
+        if self.__used[slot]:
+            same_position = self.__keys[slot] == key
+            if not same_position and self.__generations[slot] == self.generation \
+                    and self.__depths[slot] > depth:
+                return
+            if not same_position:
+                self.overwrites += 1
+        self.stores += 1
+        self.__keys[slot] = key
+        self.__scores[slot] = score
+        self.__moves[slot] = encode_move(move)
+        self.__depths[slot] = depth
+        self.__bounds[slot] = bound
+        self.__generations[slot] = self.generation
+        self.__used[slot] = 1
+
+    def clear(self) -> None:
+        for table in (self.__keys, self.__scores, self.__moves, self.__depths,
+                      self.__bounds, self.__generations, self.__used):
+            table[:] = array(table.typecode, bytes(table.itemsize * self.size))
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def get_stats(self) -> dict[str, float]:
+        return {"size": self.size, "size_mb": self.size_mb, "probes": self.probes, "hits": self.hits,
+                "hit_rate": self.hit_rate, "stores": self.stores, "overwrites": self.overwrites}
@@ -1,17 +1,95 @@
-import logging, coloredlogs
+import argparse
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+try:
+    import coloredlogs
+except ImportError:
+    coloredlogs = None
+
+
+LOG_FORMAT = '%(asctime)s - [%(pathname)s: %(lineno)d line in %(funcName)s] - %(levelname)s - %(message)s'
+LOG_LEVEL_ENV = "CHESS_LOG_LEVEL"
+LOG_FILE_ENV = "CHESS_LOG_FILE"
+TRACE_ENV = "CHESS_TRACE"
+DEFAULT_LOG_LEVEL = "WARNING"
+
+# Per-square tracing in the move validation hot path, call sites check it before logging
+TRACE = False
+
+_handlers: list[logging.Handler] = []
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def get_logger(name: str) -> logging.Logger:
-    coloredlogs.install(level=logging.DEBUG, fmt='%(asctime)s - [%(pathname)s: %(lineno)d line in %(funcName)s] - %(levelname)s - %(message)s')
-    logger = logging.getLogger(name)
-    logger.info("Information: ")
-    logger.debug("Debug: ")
-    logger.warning("Warning: ")
-    logger.error("Error: ")
-    formatter = coloredlogs.ColoredFormatter('%(asctime)s - [%(pathname)s: %(lineno)d line in %(funcName)s] - %(levelname)s - %(message)s')
-    fh = logging.FileHandler('debug.log', mode='w')
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
-    return logger
+    return logging.getLogger(name)
+
+
+# Called once at startup by the entry points, arguments default to the environment
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = None,
+                      trace: Optional[bool] = None, colored: bool = True) -> None:
+    global TRACE
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LOG_LEVEL).upper()
+    log_file = log_file or os.environ.get(LOG_FILE_ENV)
+    TRACE = trace if trace is not None else os.environ.get(TRACE_ENV, "") not in ("", "0")
+    root = logging.getLogger()
+    _remove_handlers(root)
+    root.setLevel(level)
+
+    console = logging.StreamHandler()
+    if colored and coloredlogs is not None:
+        console.setFormatter(coloredlogs.ColoredFormatter(LOG_FORMAT))
+    else:
+        console.setFormatter(logging.Formatter(LOG_FORMAT))
+    _add_handler(root, console)
+
+    if log_file:
+        _add_handler(root, _start_file_sink(log_file))
+
+
+# File writes happen on the listener thread, logging calls only enqueue the record
+def _start_file_sink(log_file: str) -> logging.Handler:
+    global _listener
+    file_handler = logging.FileHandler(log_file, mode="w")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    return logging.handlers.QueueHandler(records)
+
+
+def _add_handler(root: logging.Logger, handler: logging.Handler) -> None:
+    root.addHandler(handler)
+    _handlers.append(handler)
+
+
+def _remove_handlers(root: logging.Logger) -> None:
+    global _listener
+    for handler in _handlers:
+        root.removeHandler(handler)
+    _handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--log-level", help=f"logging level, defaults to ${LOG_LEVEL_ENV} or {DEFAULT_LOG_LEVEL}")
+    parser.add_argument("--log-file", help=f"also write the log to this file, defaults to ${LOG_FILE_ENV}")
+    parser.add_argument("--trace", action="store_true", default=None,
+                        help="log every square tested during move validation")
+
+
+def configure_logging_from_args(args: argparse.Namespace) -> None:
+    configure_logging(args.log_level, args.log_file, args.trace)
+
+
+atexit.register(lambda: _remove_handlers(logging.getLogger()))
 
 logger = get_logger(__name__)
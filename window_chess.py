@@ -1,6 +1,8 @@
-import pygame
+import argparse
 import traceback
 
+import pygame
+
 import utils
 from game_manager import GameManager
 from game_renderer import GameRenderer
@@ -46,6 +48,9 @@ class WindowChess:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Play chess in a Pygame window")
+    utils.add_logging_arguments(parser)
+    utils.configure_logging_from_args(parser.parse_args())
     game = WindowChess()
     game.run()
     
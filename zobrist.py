@@ -0,0 +1,36 @@
+import random
+from functools import lru_cache
+
+from pawns import *
+
+
+# A fixed seed keeps keys identical between runs and worker processes
+ZOBRIST_SEED = 20240601
+PIECE_TYPES = [WhitePawn, WhiteKnight, WhiteBishop, WhiteRook, WhiteQueen, WhiteKing,
+               BlackPawn, BlackKnight, BlackBishop, BlackRook, BlackQueen, BlackKing]
+
+
+class ZobristKeys:
+    def __init__(self, squares: int) -> None:
+        generator = random.Random(ZOBRIST_SEED)
+        self.side_to_move = generator.getrandbits(64)
+        self.pieces: dict[type, list[int]] = {
+            piece_type: [generator.getrandbits(64) for _ in range(squares)] for piece_type in PIECE_TYPES
+        }
+
+    def piece_key(self, pawn: Pawn, square: int) -> int:
+        return self.pieces[type(pawn)][square]
+
+    def hash_position(self, board: list[list[Pawn]], black_to_move: bool) -> int:
+        key = self.side_to_move if black_to_move else 0
+        width = len(board[0])
+        for y, row in enumerate(board):
+            for x, pawn in enumerate(row):
+                if isinstance(pawn, Pawn):
+                    key ^= self.piece_key(pawn, y * width + x)
+        return key
+
+
+@lru_cache(maxsize=None)
+def get_keys(squares: int) -> ZobristKeys:
+    return ZobristKeys(squares)